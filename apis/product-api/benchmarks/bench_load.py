@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Load-test every Product API route at several catalog sizes and save the results as JSON.
+
+Catalogs are generated with a fixed seed and cached as binary snapshots, so runs on
+different commits measure the same data. Requests go either in-process through httpx's
+ASGI transport (no sockets; measures the app alone) or to a uvicorn subprocess on a local
+port (adds HTTP parsing and the network stack, and reports the server's own RSS).
+
+Usage (from apis/product-api):
+    python benchmarks/bench_load.py [--sizes 10k,100k,1m,5m] [--mode asgi|uvicorn]
+                                    [--requests 2000] [--concurrency 16]
+                                    [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+API_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(API_DIR))
+
+from dataset import generate_batches, write_snapshot_file  # noqa: E402
+from snapshot import read_snapshot  # noqa: E402
+
+DEFAULT_SIZES = "10k,100k,1m"
+DEFAULT_DATA_DIR = Path(tempfile.gettempdir()) / "product-api-bench"
+LIST_LIMITS = (10, 100, 1000)
+SAMPLE_KEYS = 1000
+
+
+def parse_size(text: str) -> int:
+    """'10k' -> 10000, '5m' -> 5000000"""
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+def rss_bytes(pid: Optional[int] = None) -> Optional[int]:
+    """Resident set size of a process (this one by default), or None where /proc is unavailable"""
+    try:
+        with open(f"/proc/{pid or 'self'}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=API_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def catalog_snapshot(size: int, seed: int, data_dir: Path) -> Path:
+    """Path of a seeded snapshot with ``size`` products, generating it on first use"""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    path = data_dir / f"products_{size}_seed{seed}.snapshot"
+    if not path.exists():
+        start = time.perf_counter()
+        partial = path.with_suffix(".partial")
+        write_snapshot_file(generate_batches(size, seed=seed), str(partial))
+        partial.replace(path)
+        print(f"Generated {path.name} in {time.perf_counter() - start:.1f}s")
+    return path
+
+
+def scenarios(store, seed: int) -> Dict[str, Callable[[random.Random], str]]:
+    """Route name -> function returning a request path; keys are sampled from the catalog"""
+    rng = random.Random(seed)
+    rows = [store.row(rng.randrange(len(store))) for _ in range(min(SAMPLE_KEYS, len(store)))]
+    product_ids = [row["productId"] for row in rows]
+    locations = sorted({row["serviceLocationId"] for row in rows})
+    last_page = max(0, len(store) - 100)
+
+    routes = {}
+    for limit in LIST_LIMITS:
+        routes[f"all-products limit={limit}"] = lambda r, limit=limit: f"/get-all-products?limit={limit}"
+    routes["all-products deep skip"] = lambda r: f"/get-all-products?skip={last_page}&limit=100"
+    routes["product-by-id"] = lambda r: f"/get-product-by-id/{r.choice(product_ids)}"
+    routes["products-by-location limit=100"] = lambda r: f"/get-products-by-service-location-id/{r.choice(locations)}?limit=100"
+    routes["health"] = lambda r: "/health"
+    return routes
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def load(client, path_for: Callable[[random.Random], str], requests: int, concurrency: int, seed: int):
+    """Issue ``requests`` GETs with ``concurrency`` in flight; returns (latencies ms, errors, seconds)"""
+    rng = random.Random(seed)
+    paths = [path_for(rng) for _ in range(requests)]
+    latencies, errors = [], 0
+
+    async def worker(queue: List[str]):
+        nonlocal errors
+        while queue:
+            path = queue.pop()
+            start = time.perf_counter()
+            resp = await client.get(path)
+            await resp.aread()
+            latencies.append((time.perf_counter() - start) * 1000)
+            if resp.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(paths) for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+class AsgiTarget:
+    """The app in this process; the catalog is swapped in directly, as /admin/reload does"""
+
+    name = "asgi"
+
+    def __init__(self, snapshot: Path):
+        import httpx
+        import main as product_api
+
+        start = time.perf_counter()
+        product_api.catalog = self.store = read_snapshot(str(snapshot))
+        self.load_seconds = time.perf_counter() - start
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=product_api.app), base_url="http://bench")
+        self.pid = None
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class UvicornTarget:
+    """uvicorn serving main:app from the snapshot, in a subprocess on a free local port"""
+
+    name = "uvicorn"
+
+    def __init__(self, snapshot: Path, concurrency: int):
+        import httpx
+
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        env = dict(os.environ, PRODUCT_API_SNAPSHOT=str(snapshot), CATALOG_WATCH_INTERVAL="0")
+        start = time.perf_counter()
+        # main.py only prefers the snapshot while it is newer than products_10k.json in the
+        # working directory; run from the snapshot's directory, where that file does not exist
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", str(API_DIR),
+             "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+            cwd=snapshot.parent, env=env, stdout=subprocess.DEVNULL,
+        )
+        self.pid = self.process.pid
+        base_url = f"http://127.0.0.1:{port}"
+        while True:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with {self.process.returncode}")
+            try:
+                httpx.get(f"{base_url}/health").raise_for_status()
+                break
+            except httpx.HTTPError:
+                time.sleep(0.05)
+        self.load_seconds = time.perf_counter() - start
+        # Only used to sample request keys; the server process holds its own copy
+        self.store = read_snapshot(str(snapshot))
+        self.client = httpx.AsyncClient(
+            base_url=base_url, limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        )
+
+    async def close(self):
+        await self.client.aclose()
+        self.process.terminate()
+        self.process.wait()
+
+
+async def bench_size(size: int, args) -> List[dict]:
+    snapshot = catalog_snapshot(size, args.seed, args.data_dir)
+    target = AsgiTarget(snapshot) if args.mode == "asgi" else UvicornTarget(snapshot, args.concurrency)
+    routes = scenarios(target.store, args.seed)
+    if args.mode == "uvicorn":
+        target.store = None
+    print(f"\n{size:,} products ({target.name}, ready in {target.load_seconds:.2f}s, RSS {(rss_bytes(target.pid) or 0) / 2**20:.0f} MiB)")
+    print(f"  {'route':<32} {'RPS':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6} {'RSS MiB':>8}")
+
+    results = []
+    try:
+        served = (await target.client.get("/health")).json()["total_products"]
+        if served != size:
+            raise RuntimeError(f"Server is serving {served:,} products, expected {size:,} from {snapshot}")
+        for name, path_for in routes.items():
+            await load(target.client, path_for, min(args.warmup, args.requests), args.concurrency, args.seed)
+            latencies, errors, seconds = await load(target.client, path_for, args.requests, args.concurrency, args.seed)
+            rss = rss_bytes(target.pid)
+            result = {
+                "size": size,
+                "route": name,
+                "requests": len(latencies),
+                "concurrency": args.concurrency,
+                "errors": errors,
+                "seconds": seconds,
+                "rps": len(latencies) / seconds,
+                "mean_ms": statistics.mean(latencies),
+                "p50_ms": percentile(latencies, 50),
+                "p95_ms": percentile(latencies, 95),
+                "p99_ms": percentile(latencies, 99),
+                "rss_bytes": rss,
+                "catalog_ready_seconds": target.load_seconds,
+            }
+            results.append(result)
+            print(f"  {name:<32} {result['rps']:>8.0f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                  f"{result['p99_ms']:>8.2f} {errors:>6} {(rss or 0) / 2**20:>8.0f}")
+    finally:
+        await target.close()
+    return results
+
+
+def compare(results: List[dict], baseline_path: str) -> None:
+    """Print RPS and p99 changes against an earlier results file"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    before = {(r["size"], r["route"]): r for r in baseline["results"]}
+    print(f"\nCompared with {baseline_path} ({baseline['meta'].get('commit') or 'unknown commit'}):")
+    print(f"  {'size':>9} {'route':<32} {'RPS':>8} {'p99':>8}")
+    for result in results:
+        old = before.get((result["size"], result["route"]))
+        if old:
+            rps = (result["rps"] / old["rps"] - 1) * 100
+            p99 = (result["p99_ms"] / old["p99_ms"] - 1) * 100 if old["p99_ms"] else 0.0
+            print(f"  {result['size']:>9,} {result['route']:<32} {rps:>+7.1f}% {p99:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the Product API routes")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Catalog sizes, e.g. 10k,100k,1m,5m (default: {DEFAULT_SIZES})")
+    parser.add_argument("--mode", choices=("asgi", "uvicorn"), default="asgi", help="In-process ASGI transport or a local uvicorn")
+    parser.add_argument("--requests", type=int, default=2000, help="Measured requests per route")
+    parser.add_argument("--warmup", type=int, default=200, help="Unmeasured requests per route first")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight")
+    parser.add_argument("--seed", type=int, default=42, help="Dataset and request sampling seed")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help=f"Snapshot cache (default: {DEFAULT_DATA_DIR})")
+    parser.add_argument("--output", help="Results file (default: bench_load_<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    output = Path(args.output or f"bench_load_{git_commit() or 'local'}.json").resolve()
+    args.data_dir = args.data_dir.resolve()
+    if args.compare:
+        args.compare = str(Path(args.compare).resolve())
+
+    # main.py resolves its data files relative to the working directory
+    os.chdir(API_DIR)
+    results = []
+    for size in [parse_size(s) for s in args.sizes.split(",")]:
+        results.extend(asyncio.run(bench_size(size, args)))
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "mode": args.mode,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "fast_json": os.getenv("PRODUCT_API_FAST_JSON", ""),
+        },
+        "results": results,
+    }
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
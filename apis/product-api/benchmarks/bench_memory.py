@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Report bytes per product for the list-of-dicts layout and for CatalogStore.
+
+Usage (from apis/product-api):
+    python benchmarks/bench_memory.py [--records 100000]
+"""
+
+import argparse
+import json
+import sys
+import tracemalloc
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from catalog import CatalogStore  # noqa: E402
+
+DATA_FILE = Path(__file__).resolve().parent.parent / "products_10k.json"
+
+
+def load_rows(records: int):
+    """Load the fixture, repeating it with fresh ids/SKUs up to ``records`` rows"""
+    base = json.loads(DATA_FILE.read_text())
+    rows = []
+    for i in range(records):
+        row = dict(base[i % len(base)])
+        if i >= len(base):
+            row["id"] = str(uuid.uuid4())
+            row["productId"] = f"{row['productId']}-{i // len(base)}"
+        rows.append(row)
+    return rows
+
+
+def measure(build):
+    """Return (result, bytes allocated and still live after build())"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure catalog memory per product")
+    parser.add_argument("--records", type=int, default=10000, help="Number of products to load")
+    args = parser.parse_args()
+
+    serialized = json.dumps(load_rows(args.records))
+
+    rows, dict_bytes = measure(lambda: json.loads(serialized))
+    del rows
+    store, store_bytes = measure(lambda: CatalogStore(json.loads(serialized)))
+
+    print(f"Products:               {len(store)}")
+    print(f"List of dicts:          {dict_bytes / len(store):8.1f} bytes/product")
+    print(f"CatalogStore + indexes: {store_bytes / len(store):8.1f} bytes/product")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Compare the response_model path with the pre-encoded FAST_JSON path.
+
+Usage (from apis/product-api):
+    python benchmarks/bench_serialization.py [--rounds 200]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+import main  # noqa: E402
+
+
+def timed(fn, rounds: int) -> float:
+    """Return the mean milliseconds per call"""
+    fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) * 1000 / rounds
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark product list serialization")
+    parser.add_argument("--rounds", type=int, default=200, help="Calls per measurement")
+    args = parser.parse_args()
+
+    adapter = TypeAdapter(List[main.Product])
+
+    with TestClient(main.app) as client:
+        print(f"{'limit':>6} {'pydantic (ms)':>14} {'cached (ms)':>12} {'http (ms)':>10} {'http fast (ms)':>15}")
+        for limit in (10, 100, 1000):
+            rows = [row.to_dict() for row in main.catalog.page(0, limit)]
+            validated = timed(lambda: adapter.dump_json(adapter.validate_python(rows)), args.rounds)
+            cached = timed(lambda: main.catalog.encode_rows(rows), args.rounds)
+
+            url = f"/get-all-products?limit={limit}"
+            main.FAST_JSON = False
+            http = timed(lambda: client.get(url), args.rounds)
+            main.FAST_JSON = True
+            http_fast = timed(lambda: client.get(url), args.rounds)
+            main.FAST_JSON = False
+
+            print(f"{limit:>6} {validated:>14.3f} {cached:>12.3f} {http:>10.3f} {http_fast:>15.3f}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Compare catalog startup time from the indented JSON file and from a binary snapshot.
+
+Usage (from apis/product-api):
+    python benchmarks/bench_startup.py [--rounds 5]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from catalog import CatalogStore  # noqa: E402
+from snapshot import read_snapshot, write_snapshot  # noqa: E402
+
+DATA_FILE = Path(__file__).resolve().parent.parent / "products_10k.json"
+
+
+def best_of(fn, rounds: int) -> float:
+    """Return the fastest of ``rounds`` calls, in milliseconds"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def load_json() -> CatalogStore:
+    with open(DATA_FILE, "r") as f:
+        return CatalogStore(json.load(f))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark catalog startup")
+    parser.add_argument("--rounds", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = str(Path(tmp) / "products.snapshot")
+        size = write_snapshot(load_json(), snapshot_path)
+
+        json_ms = best_of(load_json, args.rounds)
+        snapshot_ms = best_of(lambda: read_snapshot(snapshot_path), args.rounds)
+
+    print(f"JSON     ({DATA_FILE.stat().st_size:>9} bytes): {json_ms:8.1f} ms")
+    print(f"Snapshot ({size:>9} bytes): {snapshot_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
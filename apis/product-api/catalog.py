@@ -0,0 +1,403 @@
+import hashlib
+import json
+import uuid
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Mapping
+from itertools import islice
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+
+    def encode_json(value: Any) -> bytes:
+        return orjson.dumps(value)
+except ImportError:
+    _encoder = json.JSONEncoder(separators=(",", ":"))
+
+    def encode_json(value: Any) -> bytes:
+        return _encoder.encode(value).encode()
+
+# Typecode for row-position arrays (unsigned 32-bit)
+POSITION_TYPECODE = "I"
+
+PRODUCT_FIELDS = ("id", "serviceLocationId", "productId", "productGroup", "name", "itemDesc", "price")
+
+
+class ProductRow(Mapping):
+    """Read-only view of one catalog row; behaves like the product dict it replaces"""
+
+    __slots__ = ("_store", "position")
+
+    def __init__(self, store: "CatalogStore", position: int):
+        self._store = store
+        self.position = position
+
+    @property
+    def id(self) -> str:
+        return _format_uuid(self._store._ids, self.position)
+
+    @property
+    def serviceLocationId(self) -> int:
+        return self._store._locations[self.position]
+
+    @property
+    def productId(self) -> str:
+        return self._store._product_ids[self.position]
+
+    @property
+    def productGroup(self) -> str:
+        return self._store._templates[self._store._template_codes[self.position]][0]
+
+    @property
+    def name(self) -> str:
+        return self._store._templates[self._store._template_codes[self.position]][1]
+
+    @property
+    def itemDesc(self) -> str:
+        return self._store._templates[self._store._template_codes[self.position]][2]
+
+    @property
+    def price(self) -> float:
+        return self._store._prices[self.position]
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in PRODUCT_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(PRODUCT_FIELDS)
+
+    def __len__(self) -> int:
+        return len(PRODUCT_FIELDS)
+
+    def to_dict(self) -> dict:
+        store, position = self._store, self.position
+        group, name, desc = store._templates[store._template_codes[position]]
+        return {
+            "id": _format_uuid(store._ids, position),
+            "serviceLocationId": store._locations[position],
+            "productId": store._product_ids[position],
+            "productGroup": group,
+            "name": name,
+            "itemDesc": desc,
+            "price": store._prices[position],
+        }
+
+    def __repr__(self) -> str:
+        return f"ProductRow({self.to_dict()!r})"
+
+
+class CatalogStore:
+    """
+    In-memory product catalog stored column-wise, with hash indexes for constant-time lookups.
+
+    UUIDs are packed to 16 bytes, serviceLocationId and price live in typed arrays, and the
+    (productGroup, name, itemDesc) triple is dictionary-encoded because it only takes a handful
+    of distinct values. Rows are exposed as ProductRow views.
+    """
+
+    def __init__(self, products: Optional[Iterable[Mapping]] = None):
+        # Columns
+        self._ids = bytearray()
+        self._product_ids: List[str] = []
+        self._locations = array("q")
+        self._prices = array("d")
+        self._template_codes = array("I")
+        # Dictionary for the (productGroup, name, itemDesc) column
+        self._templates: List[Tuple[str, str, str]] = []
+        self._template_lookup: Dict[Tuple[str, str, str], int] = {}
+
+        # productId (SKU) -> row position
+        self._by_product_id: Dict[str, int] = {}
+        # UUID (as int) -> row position
+        self._by_id: Dict[int, int] = {}
+        # serviceLocationId -> ascending row positions
+        self._by_location: Dict[int, array] = {}
+        # lower-cased productGroup -> ascending row positions
+        self._by_group: Dict[str, array] = {}
+        # Row positions ordered by productId, used for keyset (cursor) pagination
+        self._sorted = array(POSITION_TYPECODE)
+        self._sorted_by_location: Dict[int, array] = {}
+        self._sorted_by_group: Dict[str, array] = {}
+        # (serviceLocationId, lower-cased productGroup) -> row positions ordered by productId
+        self._sorted_by_location_group: Dict[Tuple[int, str], array] = {}
+        # productId -> pre-encoded JSON bytes, filled on first use
+        self._encoded: Dict[str, bytes] = {}
+        # Content hash of the columns, computed on first use
+        self._version: Optional[str] = None
+
+        for product in products or []:
+            self._insert(product)
+        self._build_sort_orders()
+
+    def __len__(self) -> int:
+        return len(self._product_ids)
+
+    def row(self, position: int) -> ProductRow:
+        return ProductRow(self, position)
+
+    @property
+    def version(self) -> str:
+        """Content hash of the catalog; identical data gives the same version on every replica"""
+        if self._version is None:
+            digest = hashlib.blake2b(digest_size=12)
+            digest.update(self._ids)
+            digest.update("\n".join(self._product_ids).encode("utf-8"))
+            digest.update(self._locations.tobytes())
+            digest.update(self._prices.tobytes())
+            digest.update(self._template_codes.tobytes())
+            digest.update(json.dumps(self._templates).encode("utf-8"))
+            self._version = digest.hexdigest()
+        return self._version
+
+    def _insert(self, product: Mapping) -> int:
+        """Add a row, or replace the earlier row with the same productId, and update the indexes"""
+        uuid_bytes = uuid.UUID(product["id"]).bytes
+        template = (product["productGroup"], product["name"], product["itemDesc"])
+        code = self._template_lookup.get(template)
+        if code is None:
+            code = self._template_lookup[template] = len(self._templates)
+            self._templates.append(template)
+
+        position = self._by_product_id.get(product["productId"])
+        if position is None:
+            position = len(self)
+            self._ids += uuid_bytes
+            self._product_ids.append(product["productId"])
+            self._locations.append(product["serviceLocationId"])
+            self._prices.append(product["price"])
+            self._template_codes.append(code)
+        else:
+            previous = self.row(position)
+            previous_id = int.from_bytes(self._ids[position * 16:position * 16 + 16], "big")
+            if self._by_id.get(previous_id) == position:
+                del self._by_id[previous_id]
+            _unlink(self._by_location, previous.serviceLocationId, position)
+            _unlink(self._by_group, previous.productGroup.lower(), position)
+            self._ids[position * 16:position * 16 + 16] = uuid_bytes
+            self._locations[position] = product["serviceLocationId"]
+            self._prices[position] = product["price"]
+            self._template_codes[position] = code
+            self._encoded.pop(product["productId"], None)
+
+        self._by_product_id[product["productId"]] = position
+        self._by_id[int.from_bytes(uuid_bytes, "big")] = position
+        _link(_positions(self._by_location, product["serviceLocationId"]), position)
+        _link(_positions(self._by_group, product["productGroup"].lower()), position)
+        return position
+
+    def _sort_key(self, position: int) -> str:
+        return self._product_ids[position]
+
+    def _build_sort_orders(self, sorted_positions: Optional[array] = None) -> None:
+        """Order every index by productId after a bulk load, sorting the catalog once"""
+        if sorted_positions is None:
+            sorted_positions = array(POSITION_TYPECODE, sorted(range(len(self)), key=self._sort_key))
+        self._sorted = sorted_positions
+
+        # Walking the global order keeps each per-key list ordered without sorting it again
+        locations, codes = self._locations, self._template_codes
+        group_keys = [group.lower() for group, _, _ in self._templates]
+        self._sorted_by_location = {}
+        self._sorted_by_group = {}
+        self._sorted_by_location_group = {}
+        for p in sorted_positions:
+            location, group = locations[p], group_keys[codes[p]]
+            _positions(self._sorted_by_location, location).append(p)
+            _positions(self._sorted_by_group, group).append(p)
+            _positions(self._sorted_by_location_group, (location, group)).append(p)
+
+    @classmethod
+    def from_columns(
+        cls,
+        ids: bytearray,
+        product_ids: List[str],
+        locations: array,
+        prices: array,
+        template_codes: array,
+        templates: List[Tuple[str, str, str]],
+        sorted_positions: Optional[array] = None,
+    ) -> "CatalogStore":
+        """Build a store directly from column data (e.g. a binary snapshot), indexing in bulk"""
+        store = cls()
+        store._ids = ids
+        store._product_ids = product_ids
+        store._locations = locations
+        store._prices = prices
+        store._template_codes = template_codes
+        store._templates = [tuple(template) for template in templates]
+        store._template_lookup = {template: code for code, template in enumerate(store._templates)}
+
+        count = len(product_ids)
+        store._by_product_id = dict(zip(product_ids, range(count)))
+        store._by_id = {int.from_bytes(ids[p * 16:p * 16 + 16], "big"): p for p in range(count)}
+        group_keys = [group.lower() for group, _, _ in store._templates]
+        for p in range(count):
+            _positions(store._by_location, locations[p]).append(p)
+            _positions(store._by_group, group_keys[template_codes[p]]).append(p)
+        store._build_sort_orders(sorted_positions)
+        return store
+
+    def columns(self) -> Dict[str, Any]:
+        """Column data in the shape accepted by from_columns"""
+        return {
+            "ids": self._ids,
+            "product_ids": self._product_ids,
+            "locations": self._locations,
+            "prices": self._prices,
+            "template_codes": self._template_codes,
+            "templates": self._templates,
+            "sorted_positions": self._sorted,
+        }
+
+    def _rows(self, positions: Iterable[int]) -> List[ProductRow]:
+        return [ProductRow(self, p) for p in positions]
+
+    def _seek(self, order: array, after: Optional[str], limit: int) -> Tuple[List[ProductRow], bool]:
+        """Return up to ``limit`` rows whose productId sorts after ``after``, and whether more remain"""
+        start = 0 if after is None else bisect_right(order, after, key=self._sort_key)
+        end = start + limit
+        return self._rows(order[start:end]), end < len(order)
+
+    def encode_rows(self, rows: List[Mapping]) -> bytes:
+        """Encode rows as a JSON array, reusing each product's cached encoding"""
+        encoded = self._encoded
+        parts = []
+        for row in rows:
+            data = encoded.get(row["productId"])
+            if data is None:
+                data = encoded[row["productId"]] = encode_json(_as_dict(row))
+            parts.append(data)
+        return b"[" + b",".join(parts) + b"]"
+
+    def get(self, product_id: str) -> Optional[ProductRow]:
+        """Return the product with the given productId (SKU), if any"""
+        position = self._by_product_id.get(product_id)
+        return None if position is None else ProductRow(self, position)
+
+    def get_by_id(self, id: str) -> Optional[ProductRow]:
+        """Return the product with the given UUID id, if any"""
+        try:
+            position = self._by_id.get(uuid.UUID(id).int)
+        except ValueError:
+            return None
+        return None if position is None else ProductRow(self, position)
+
+    def page(self, skip: int, limit: int) -> List[ProductRow]:
+        """Return a slice of the catalog in load order"""
+        return self._rows(range(skip, min(skip + limit, len(self))))
+
+    def page_after(self, after: Optional[str], limit: int) -> Tuple[List[ProductRow], bool]:
+        """Keyset page of the catalog ordered by productId"""
+        return self._seek(self._sorted, after, limit)
+
+    def iter_rows(
+        self, service_location_id: Optional[int] = None, product_group: Optional[str] = None
+    ) -> Iterator[ProductRow]:
+        """Iterate products in load order, optionally filtered by location and/or group"""
+        if service_location_id is None and product_group is None:
+            positions = range(len(self))
+        else:
+            positions = None
+            if service_location_id is not None:
+                positions = self._by_location.get(service_location_id, [])
+            if product_group is not None:
+                group_positions = self._by_group.get(product_group.lower(), [])
+                if positions is None:
+                    positions = group_positions
+                else:
+                    # Both filters: walk the smaller index and check the other one
+                    if len(group_positions) < len(positions):
+                        positions, group_positions = group_positions, positions
+                    members = set(group_positions)
+                    positions = [p for p in positions if p in members]
+        for p in positions:
+            yield ProductRow(self, p)
+
+    def has_location(self, service_location_id: int) -> bool:
+        """Whether any product is stocked at the given service location"""
+        return service_location_id in self._by_location
+
+    def page_by_location(self, service_location_id: int, skip: int, limit: int) -> List[ProductRow]:
+        """Return a slice of the products at a service location, in load order"""
+        positions = self._by_location.get(service_location_id, [])
+        return self._rows(positions[skip:skip + limit])
+
+    def page_by_location_after(
+        self, service_location_id: int, after: Optional[str], limit: int
+    ) -> Tuple[List[ProductRow], bool]:
+        """Keyset page of the products at a service location, ordered by productId"""
+        return self._seek(self._sorted_by_location.get(service_location_id, []), after, limit)
+
+    def has_location_group(self, service_location_id: int, product_group: str) -> bool:
+        """Whether any product in the given group (case-insensitive) is stocked at the location"""
+        return (service_location_id, product_group.lower()) in self._sorted_by_location_group
+
+    def page_by_location_group(
+        self, service_location_id: int, product_group: str, skip: int, limit: int
+    ) -> List[ProductRow]:
+        """Return a slice of the products in a group at a service location, in load order"""
+        rows = self.iter_rows(service_location_id, product_group)
+        return list(islice(rows, skip, skip + limit))
+
+    def page_by_location_group_after(
+        self, service_location_id: int, product_group: str, after: Optional[str], limit: int
+    ) -> Tuple[List[ProductRow], bool]:
+        """Keyset page of the products in a group at a service location, ordered by productId"""
+        key = (service_location_id, product_group.lower())
+        return self._seek(self._sorted_by_location_group.get(key, []), after, limit)
+
+    def has_group(self, product_group: str) -> bool:
+        """Whether any product belongs to the given group (case-insensitive)"""
+        return product_group.lower() in self._by_group
+
+    def page_by_group(self, product_group: str, skip: int, limit: int) -> List[ProductRow]:
+        """Return a slice of the products in a group (case-insensitive), in load order"""
+        positions = self._by_group.get(product_group.lower(), [])
+        return self._rows(positions[skip:skip + limit])
+
+    def page_by_group_after(
+        self, product_group: str, after: Optional[str], limit: int
+    ) -> Tuple[List[ProductRow], bool]:
+        """Keyset page of the products in a group (case-insensitive), ordered by productId"""
+        return self._seek(self._sorted_by_group.get(product_group.lower(), []), after, limit)
+
+
+def _format_uuid(ids: bytearray, position: int) -> str:
+    """Format a packed 16-byte UUID column entry in canonical form"""
+    h = ids[position * 16:position * 16 + 16].hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _as_dict(row: Mapping) -> dict:
+    return row.to_dict() if isinstance(row, ProductRow) else dict(row)
+
+
+def _positions(index: Dict[Hashable, array], name: Hashable) -> array:
+    """Return the position array for an index entry, creating it if needed"""
+    positions = index.get(name)
+    if positions is None:
+        positions = index[name] = array(POSITION_TYPECODE)
+    return positions
+
+
+def _link(positions: array, position: int) -> None:
+    """Add a row position to an ascending index"""
+    if not positions or positions[-1] < position:
+        positions.append(position)
+    else:
+        insort(positions, position)
+
+
+def _unlink(index: Dict[Hashable, array], name: Hashable, position: int) -> None:
+    """Remove a row position from an ascending index, dropping empty entries"""
+    positions = index.get(name)
+    if not positions:
+        return
+    i = bisect_left(positions, position)
+    if i < len(positions) and positions[i] == position:
+        del positions[i]
+    if not positions:
+        del index[name]
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Synthetic product dataset generator.
+
+Rows are generated in batches. Every SKU is unique by construction: each SKU prefix walks a
+fixed permutation of its number range instead of retrying on collisions. NumPy is used to
+vectorize each batch when it is installed; otherwise a pure-Python batch is used. Pass a seed
+for reproducible benchmark fixtures (the NumPy and pure-Python modes produce different data).
+
+Usage:
+    python dataset.py --records 5000000 --locations 50 --seed 42 --format ndjson --output products_5m.ndjson
+"""
+
+import argparse
+import itertools
+import math
+import random
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from catalog import CatalogStore, encode_json
+
+# Mock Data Sources
+SERVICE_LOCATIONS = [10020030, 40050099, 10020031, 55002211, 80009000]
+
+PRODUCT_TEMPLATES = [
+    {"group": "Produce", "name": "Organic Cavendish Bananas", "base_price": 0.79, "desc": "Fresh, fair-trade organic bananas grown in Ecuador."},
+    {"group": "Produce", "name": "Red Delicious Apples", "base_price": 1.29, "desc": "Crisp and sweet red apples, perfect for snacking."},
+    {"group": "Produce", "name": "Hass Avocados", "base_price": 1.50, "desc": "Creamy, ripe avocados. Great for guacamole."},
+    {"group": "Dairy", "name": "Whole Milk (1 Gallon)", "base_price": 4.29, "desc": "Pasteurized, homogenized whole milk with Vitamin D."},
+    {"group": "Dairy", "name": "Greek Yogurt (Strawberry)", "base_price": 1.19, "desc": "Rich and creamy greek yogurt with real fruit on the bottom."},
+    {"group": "Dairy", "name": "Unsalted Butter", "base_price": 3.99, "desc": "Grade AA sweet cream butter, perfect for baking."},
+    {"group": "Bakery", "name": "Sourdough Loaf", "base_price": 5.49, "desc": "Hearth-baked sourdough with a crispy crust."},
+    {"group": "Bakery", "name": "Blueberry Muffins (4 Pack)", "base_price": 4.99, "desc": "Moist muffins loaded with fresh blueberries."},
+    {"group": "Meat", "name": "Boneless Skinless Chicken Breast", "base_price": 5.99, "desc": "Lean, air-chilled chicken breast. No antibiotics."},
+    {"group": "Meat", "name": "Ground Beef (80/20)", "base_price": 6.49, "desc": "Premium ground beef, ideal for burgers and tacos."},
+    {"group": "Pantry", "name": "Tomato Sauce", "base_price": 2.50, "desc": "Classic marinara sauce made with vine-ripened tomatoes."},
+    {"group": "Pantry", "name": "Spaghetti Pasta", "base_price": 1.25, "desc": "Enriched wheat pasta. Cooks in 10 minutes."},
+    {"group": "Beverages", "name": "Orange Juice (Pulp Free)", "base_price": 3.99, "desc": "100% pure squeezed orange juice. Not from concentrate."},
+    {"group": "Frozen", "name": "Pepperoni Pizza", "base_price": 7.50, "desc": "Thin crust pizza topped with mozzarella and pepperoni."}
+]
+
+# SKU numbers start here; the range is widened beyond 99999 only when a catalog needs it
+SKU_NUMBER_START = 1000
+SKU_NUMBER_WIDTH = 99000
+DEFAULT_BATCH_SIZE = 100_000
+FORMATS = ("json", "ndjson", "snapshot")
+
+
+def service_locations(count: int = len(SERVICE_LOCATIONS)) -> List[int]:
+    """The mock service locations, padded with synthetic ids when more are requested"""
+    if count <= len(SERVICE_LOCATIONS):
+        return SERVICE_LOCATIONS[:count]
+    return SERVICE_LOCATIONS + [90000000 + i for i in range(count - len(SERVICE_LOCATIONS))]
+
+
+class SkuAllocator:
+    """
+    Hands out collision-free SKU numbers per prefix.
+
+    The n-th SKU of a prefix is START + (a * n + b) mod width with gcd(a, width) == 1, which is a
+    permutation of the range: no retries, no set of used ids, and the numbers still look random.
+    """
+
+    def __init__(self, prefixes: List[str], capacity: int, rng: random.Random):
+        self.prefixes = prefixes
+        self.width = max(SKU_NUMBER_WIDTH, capacity)
+        self.counters = [0] * len(prefixes)
+        self.multipliers = []
+        self.offsets = []
+        for _ in prefixes:
+            a = rng.randrange(1, self.width)
+            while math.gcd(a, self.width) != 1:
+                a = rng.randrange(1, self.width)
+            self.multipliers.append(a)
+            self.offsets.append(rng.randrange(self.width))
+
+    def next(self, prefix_index: int) -> str:
+        n = self.counters[prefix_index]
+        if n >= self.width:
+            raise ValueError(f"SKU range exhausted for prefix {self.prefixes[prefix_index]}")
+        self.counters[prefix_index] = n + 1
+        number = SKU_NUMBER_START + (self.multipliers[prefix_index] * n + self.offsets[prefix_index]) % self.width
+        return f"SKU-{self.prefixes[prefix_index]}-{number}"
+
+    def take(self, prefix_index: int, count: int) -> List[str]:
+        """Allocate ``count`` SKUs for one prefix at once (vectorized when NumPy is available)"""
+        start = self.counters[prefix_index]
+        if start + count > self.width:
+            raise ValueError(f"SKU range exhausted for prefix {self.prefixes[prefix_index]}")
+        self.counters[prefix_index] = start + count
+        a, b, prefix = self.multipliers[prefix_index], self.offsets[prefix_index], self.prefixes[prefix_index]
+        if np is not None:
+            n = np.arange(start, start + count, dtype=np.int64)
+            numbers = (SKU_NUMBER_START + (a * n + b) % self.width).tolist()
+        else:
+            numbers = [SKU_NUMBER_START + (a * n + b) % self.width for n in range(start, start + count)]
+        return [f"SKU-{prefix}-{number}" for number in numbers]
+
+
+def _plan(num_records: int, num_locations: int, seed: Optional[int]):
+    rng = random.Random(seed)
+    prefixes = sorted({template["name"][:3].upper() for template in PRODUCT_TEMPLATES})
+    prefix_index = [prefixes.index(template["name"][:3].upper()) for template in PRODUCT_TEMPLATES]
+    allocator = SkuAllocator(prefixes, num_records, rng)
+    return rng, allocator, prefix_index, service_locations(num_locations)
+
+
+def _format_uuid4(raw: bytes) -> str:
+    """Format 16 random bytes as a version-4 UUID string"""
+    h = raw.hex()
+    variant = "89ab"[int(h[16], 16) & 3]
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{variant}{h[17:20]}-{h[20:32]}"
+
+
+def _row(id: str, location: int, product_id: str, template: Dict, price: float) -> Dict:
+    return {
+        "id": id,
+        "serviceLocationId": location,
+        "productId": product_id,
+        "productGroup": template["group"],
+        "name": template["name"],
+        "itemDesc": template["desc"],
+        "price": price
+    }
+
+
+def _python_batch(size: int, rng: random.Random, allocator: SkuAllocator, prefix_index: List[int], locations: List[int]) -> List[Dict]:
+    rows = []
+    for _ in range(size):
+        t = rng.randrange(len(PRODUCT_TEMPLATES))
+        template = PRODUCT_TEMPLATES[t]
+        price = round(max(0.50, template["base_price"] + rng.uniform(-0.10, 0.50)), 2)
+        rows.append(_row(_format_uuid4(rng.randbytes(16)), rng.choice(locations), allocator.next(prefix_index[t]), template, price))
+    return rows
+
+
+def _numpy_batch(size: int, gen, allocator: SkuAllocator, prefix_index: List[int], locations: List[int]) -> List[Dict]:
+    template_ids = gen.integers(0, len(PRODUCT_TEMPLATES), size=size)
+    base_prices = np.array([template["base_price"] for template in PRODUCT_TEMPLATES])
+    prices = np.round(np.maximum(0.50, base_prices[template_ids] + gen.uniform(-0.10, 0.50, size=size)), 2).tolist()
+    row_locations = np.asarray(locations, dtype=np.int64)[gen.integers(0, len(locations), size=size)].tolist()
+    uuid_bytes = gen.bytes(16 * size)
+
+    # Allocate SKUs per prefix in one call each, then scatter them back to row order
+    prefixes = np.asarray(prefix_index)[template_ids]
+    product_ids = [None] * size
+    for p in np.unique(prefixes).tolist():
+        rows_for_prefix = np.flatnonzero(prefixes == p).tolist()
+        for row, sku in zip(rows_for_prefix, allocator.take(p, len(rows_for_prefix))):
+            product_ids[row] = sku
+
+    return [
+        _row(_format_uuid4(uuid_bytes[i * 16:i * 16 + 16]), row_locations[i], product_ids[i], PRODUCT_TEMPLATES[t], prices[i])
+        for i, t in enumerate(template_ids.tolist())
+    ]
+
+
+def generate_batches(
+    num_records: int,
+    num_locations: int = len(SERVICE_LOCATIONS),
+    seed: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    vectorized: bool = True,
+) -> Iterator[List[Dict]]:
+    """Yield lists of at most ``batch_size`` unique product records, ``num_records`` in total"""
+    rng, allocator, prefix_index, locations = _plan(num_records, num_locations, seed)
+    use_numpy = vectorized and np is not None
+    gen = np.random.default_rng(seed) if use_numpy else None
+
+    remaining = num_records
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        if use_numpy:
+            yield _numpy_batch(size, gen, allocator, prefix_index, locations)
+        else:
+            yield _python_batch(size, rng, allocator, prefix_index, locations)
+        remaining -= size
+
+
+def write_json(batches: Iterable[List[Dict]], path: str) -> int:
+    """Stream records to a JSON array file, one record per line; returns the record count"""
+    count = 0
+    with open(path, "wb") as f:
+        f.write(b"[")
+        for batch in batches:
+            if batch:
+                f.write(b",\n" if count else b"\n")
+                f.write(b",\n".join(encode_json(row) for row in batch))
+                count += len(batch)
+        f.write(b"\n]\n")
+    return count
+
+
+def write_ndjson(batches: Iterable[List[Dict]], path: str) -> int:
+    """Stream records to a newline-delimited JSON file; returns the record count"""
+    count = 0
+    with open(path, "wb") as f:
+        for batch in batches:
+            f.write(b"".join(encode_json(row) + b"\n" for row in batch))
+            count += len(batch)
+    return count
+
+
+def write_snapshot_file(batches: Iterable[List[Dict]], path: str) -> int:
+    """Index records into a CatalogStore and write a binary snapshot; returns the record count"""
+    from snapshot import write_snapshot
+
+    store = CatalogStore(itertools.chain.from_iterable(batches))
+    write_snapshot(store, path)
+    return len(store)
+
+
+WRITERS = {"json": write_json, "ndjson": write_ndjson, "snapshot": write_snapshot_file}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic product catalog")
+    parser.add_argument("--records", type=int, default=10000, help="Number of products to generate")
+    parser.add_argument("--locations", type=int, default=len(SERVICE_LOCATIONS), help="Number of service locations")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible output")
+    parser.add_argument("--format", choices=FORMATS, default="json", help="Output format")
+    parser.add_argument("--output", required=True, help="Output file path")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Records generated per batch")
+    parser.add_argument("--no-numpy", action="store_true", help="Use the pure-Python generator even if NumPy is installed")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    batches = generate_batches(args.records, args.locations, args.seed, args.batch_size, not args.no_numpy)
+    count = WRITERS[args.format](batches, args.output)
+    print(f"Wrote {count} records to {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,51 @@
+import asyncio
 import json
-import uuid
-import random
-from typing import List, Optional
-from fastapi import FastAPI, HTTPException, Query
+import os
+import time
+import base64
+import hmac
+import zlib
+from typing import List, Optional, Union
+from fastapi import FastAPI, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import Match
 import uvicorn
 
+from catalog import CatalogStore, encode_json
+from dataset import SERVICE_LOCATIONS, generate_batches, write_json
+from snapshot import read_snapshot, write_snapshot
+import metrics
+
 # Configuration
-NUM_RECORDS = 10000
+NUM_RECORDS = int(os.getenv("NUM_RECORDS", "10000"))
+NUM_LOCATIONS = int(os.getenv("NUM_LOCATIONS", str(len(SERVICE_LOCATIONS))))
+# Optional seed so a generated dataset is reproducible
+DATASET_SEED = int(os.environ["DATASET_SEED"]) if os.getenv("DATASET_SEED") else None
 DATA_FILE = "products_10k.json"
+# Binary snapshot of DATA_FILE, preferred at startup while it is at least as new as the JSON
+SNAPSHOT_FILE = os.getenv("PRODUCT_API_SNAPSHOT", "products_10k.snapshot")
+EXPORT_CHUNK_ROWS = 1000
+# Seconds between checks for catalog file changes (0 disables the watcher)
+CATALOG_WATCH_INTERVAL = float(os.getenv("CATALOG_WATCH_INTERVAL", "0"))
+# Shared secret for admin endpoints (unset disables them)
+ADMIN_TOKEN = os.getenv("PRODUCT_API_ADMIN_TOKEN")
+# Serve list responses from pre-encoded JSON instead of validating through response_model
+FAST_JSON = os.getenv("PRODUCT_API_FAST_JSON", "").lower() in ("1", "true", "yes")
+# Requests slower than this are logged with their trace id (0 disables the log)
+SLOW_REQUEST_SECONDS = float(os.getenv("PRODUCT_API_SLOW_REQUEST_SECONDS", "1"))
 
-# Mock Data Sources
-SERVICE_LOCATIONS = [10020030, 40050099, 10020031, 55002211, 80009000]
-
-PRODUCT_TEMPLATES = [
-    {"group": "Produce", "name": "Organic Cavendish Bananas", "base_price": 0.79, "desc": "Fresh, fair-trade organic bananas grown in Ecuador."},
-    {"group": "Produce", "name": "Red Delicious Apples", "base_price": 1.29, "desc": "Crisp and sweet red apples, perfect for snacking."},
-    {"group": "Produce", "name": "Hass Avocados", "base_price": 1.50, "desc": "Creamy, ripe avocados. Great for guacamole."},
-    {"group": "Dairy", "name": "Whole Milk (1 Gallon)", "base_price": 4.29, "desc": "Pasteurized, homogenized whole milk with Vitamin D."},
-    {"group": "Dairy", "name": "Greek Yogurt (Strawberry)", "base_price": 1.19, "desc": "Rich and creamy greek yogurt with real fruit on the bottom."},
-    {"group": "Dairy", "name": "Unsalted Butter", "base_price": 3.99, "desc": "Grade AA sweet cream butter, perfect for baking."},
-    {"group": "Bakery", "name": "Sourdough Loaf", "base_price": 5.49, "desc": "Hearth-baked sourdough with a crispy crust."},
-    {"group": "Bakery", "name": "Blueberry Muffins (4 Pack)", "base_price": 4.99, "desc": "Moist muffins loaded with fresh blueberries."},
-    {"group": "Meat", "name": "Boneless Skinless Chicken Breast", "base_price": 5.99, "desc": "Lean, air-chilled chicken breast. No antibiotics."},
-    {"group": "Meat", "name": "Ground Beef (80/20)", "base_price": 6.49, "desc": "Premium ground beef, ideal for burgers and tacos."},
-    {"group": "Pantry", "name": "Tomato Sauce", "base_price": 2.50, "desc": "Classic marinara sauce made with vine-ripened tomatoes."},
-    {"group": "Pantry", "name": "Spaghetti Pasta", "base_price": 1.25, "desc": "Enriched wheat pasta. Cooks in 10 minutes."},
-    {"group": "Beverages", "name": "Orange Juice (Pulp Free)", "base_price": 3.99, "desc": "100% pure squeezed orange juice. Not from concentrate."},
-    {"group": "Frozen", "name": "Pepperoni Pizza", "base_price": 7.50, "desc": "Thin crust pizza topped with mozzarella and pepperoni."}
-]
+# Metrics (served on /metrics)
+REQUEST_DURATION = metrics.histogram(
+    "product_api_request_duration_seconds", "Time to serve a request, by route template", ("method", "route", "status")
+)
+CATALOG_PRODUCTS = metrics.gauge("product_api_catalog_products", "Products in the loaded catalog")
+CATALOG_BUILD_SECONDS = metrics.gauge(
+    "product_api_catalog_build_seconds", "Duration of the last catalog build, by stage", ("stage",)
+)
+CATALOG_RELOADS = metrics.counter("product_api_catalog_reloads", "Catalog reloads, by result", ("result",))
 
 # Pydantic Models
 class Product(BaseModel):
@@ -40,6 +57,10 @@ class Product(BaseModel):
     itemDesc: str
     price: float
 
+class ProductPage(BaseModel):
+    items: List[Product]
+    next_cursor: Optional[str] = None
+
 # FastAPI App
 app = FastAPI(
     title="Product API",
@@ -47,65 +68,257 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Routes whose responses depend only on the catalog contents, and so can be revalidated by ETag
+CATALOG_PATH_PREFIXES = ("/get-all-products", "/get-product-by-id/", "/get-products-by-", "/export-products")
+
+class CatalogETagMiddleware:
+    """
+    Tag catalog reads with an ETag derived from the catalog version and answer a matching
+    If-None-Match with 304, so clients can revalidate cached pages without a transfer.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or not scope["path"].startswith(CATALOG_PATH_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        etag = f'W/"{catalog.version}"'
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+            await Response(status_code=304, headers={"ETag": etag})(scope, receive, send)
+            return
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and 200 <= message["status"] < 300:
+                MutableHeaders(scope=message).append("ETag", etag)
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+class MetricsMiddleware:
+    """
+    Record request durations by route template, and log slow requests with the trace id
+    from their traceparent header (set by the MCP server) so they can be matched to tool calls.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = route_template(scope)
+            REQUEST_DURATION.labels(scope["method"], route, status).observe(elapsed)
+            if SLOW_REQUEST_SECONDS and elapsed >= SLOW_REQUEST_SECONDS:
+                traceparent = Headers(scope=scope).get("traceparent")
+                print(f"Slow request {scope['method']} {scope['path']} -> {status} in {elapsed:.3f}s "
+                      f"trace_id={metrics.trace_id(traceparent) or '-'}")
+
+def route_template(scope) -> str:
+    """Path template of the matched route; bounded label values even for arbitrary ids"""
+    route = scope.get("route")
+    if route is None:
+        # Answered before routing (e.g. a 304 from the ETag middleware), or no route matched
+        route = next((r for r in app.router.routes if r.matches(scope)[0] == Match.FULL), None)
+    return getattr(route, "path", "unmatched")
+
+app.add_middleware(CatalogETagMiddleware)
+# Added last so it is outermost and also times responses short-circuited by the ETag middleware
+app.add_middleware(MetricsMiddleware)
+
 # Global data storage
-products_data: List[dict] = []
+catalog = CatalogStore()
+CATALOG_PRODUCTS.set_function(lambda: len(catalog))
+catalog_loaded_mtime = 0.0
+reload_lock = asyncio.Lock()
+watcher_task: Optional[asyncio.Task] = None
+
+CURSOR_DESCRIPTION = (
+    "Opaque cursor from a previous page's next_cursor. "
+    "Pass an empty value to start cursor pagination; skip is ignored in this mode"
+)
+
+def encode_cursor(product_id: str) -> str:
+    """Encode the last productId of a page as an opaque cursor"""
+    return base64.urlsafe_b64encode(product_id.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Optional[str]:
+    """Decode a cursor back to the productId to seek after (None for the first page)"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded, altchars=b"-_", validate=True).decode()
+    except ValueError:
+        # binascii.Error, UnicodeDecodeError, and non-ASCII input all raise ValueError
+        raise HTTPException(status_code=400, detail=f"Invalid cursor '{cursor}'")
+
+def to_page(rows: List[dict], has_more: bool):
+    """Build a cursor-mode response from a keyset page"""
+    next_cursor = encode_cursor(rows[-1]["productId"]) if rows and has_more else None
+    if FAST_JSON:
+        body = b'{"items":' + catalog.encode_rows(rows) + b',"next_cursor":' + encode_json(next_cursor) + b"}"
+        return Response(body, media_type="application/json")
+    return {"items": [row.to_dict() for row in rows], "next_cursor": next_cursor}
+
+def to_list(rows: List[dict]):
+    """Build a list response, from the pre-encoded cache when FAST_JSON is on"""
+    if FAST_JSON:
+        return Response(catalog.encode_rows(rows), media_type="application/json")
+    return [row.to_dict() for row in rows]
 
 def generate_dataset():
     """Generate product dataset if it doesn't exist"""
-    data = []
-    used_product_ids = set()
-    
     print(f"Generating {NUM_RECORDS} unique records...")
-    
-    count = 0
-    while count < NUM_RECORDS:
-        template = random.choice(PRODUCT_TEMPLATES)
-        price_variation = random.uniform(-0.10, 0.50)
-        final_price = round(max(0.50, template["base_price"] + price_variation), 2)
-        
-        sku_prefix = template["name"][:3].upper()
-        sku_num = random.randint(1000, 99999)
-        product_id = f"SKU-{sku_prefix}-{sku_num}"
-        
-        if product_id in used_product_ids:
-            continue
-        
-        used_product_ids.add(product_id)
-        
-        item = {
-            "id": str(uuid.uuid4()),
-            "serviceLocationId": random.choice(SERVICE_LOCATIONS),
-            "productId": product_id,
-            "productGroup": template["group"],
-            "name": template["name"],
-            "itemDesc": template["desc"],
-            "price": final_price
-        }
-        
-        data.append(item)
-        count += 1
 
-    with open(DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    data = [
+        item
+        for batch in generate_batches(NUM_RECORDS, NUM_LOCATIONS, DATASET_SEED)
+        for item in batch
+    ]
+    write_json([data], DATA_FILE)
         
     print(f"Successfully created {DATA_FILE} with {len(data)} unique items.")
     return data
 
-def load_products():
-    """Load products from JSON file"""
-    global products_data
+def snapshot_is_current() -> bool:
+    """Whether SNAPSHOT_FILE exists and is not older than DATA_FILE"""
+    if not SNAPSHOT_FILE or not os.path.exists(SNAPSHOT_FILE):
+        return False
+    return not os.path.exists(DATA_FILE) or os.path.getmtime(SNAPSHOT_FILE) >= os.path.getmtime(DATA_FILE)
+
+def build_catalog(generate_missing: bool = True) -> CatalogStore:
+    """Build a catalog from the binary snapshot or JSON file; safe to run off the event loop"""
+    if snapshot_is_current():
+        try:
+            start = time.perf_counter()
+            store = read_snapshot(SNAPSHOT_FILE)
+            CATALOG_BUILD_SECONDS.labels("snapshot").set(time.perf_counter() - start)
+            print(f"Loaded {len(store)} products from {SNAPSHOT_FILE} (version {store.version})")
+            return store
+        except (OSError, ValueError) as e:
+            print(f"Could not read {SNAPSHOT_FILE} ({e}), falling back to {DATA_FILE}")
+
+    generated = False
+    start = time.perf_counter()
     try:
         with open(DATA_FILE, 'r') as f:
             products_data = json.load(f)
+        CATALOG_BUILD_SECONDS.labels("json").set(time.perf_counter() - start)
         print(f"Loaded {len(products_data)} products from {DATA_FILE}")
     except FileNotFoundError:
+        if not generate_missing:
+            raise
         print(f"{DATA_FILE} not found, generating new dataset...")
         products_data = generate_dataset()
+        CATALOG_BUILD_SECONDS.labels("generate").set(time.perf_counter() - start)
+        generated = True
+
+    start = time.perf_counter()
+    store = CatalogStore(products_data)
+    CATALOG_BUILD_SECONDS.labels("index").set(time.perf_counter() - start)
+    print(f"Indexed {len(store)} products (version {store.version})")
+
+    if generated and SNAPSHOT_FILE:
+        try:
+            write_snapshot(store, SNAPSHOT_FILE)
+            print(f"Wrote snapshot {SNAPSHOT_FILE}")
+        except OSError as e:
+            print(f"Could not write {SNAPSHOT_FILE}: {e}")
+    return store
+
+def catalog_source_mtime() -> float:
+    """Latest modification time of the catalog source files (0 if none exist)"""
+    mtimes = [os.path.getmtime(path) for path in (DATA_FILE, SNAPSHOT_FILE) if path and os.path.exists(path)]
+    return max(mtimes, default=0.0)
+
+def load_products():
+    """Load products from the binary snapshot or JSON file and build the catalog indexes"""
+    global catalog, catalog_loaded_mtime
+    catalog_loaded_mtime = catalog_source_mtime()
+    catalog = build_catalog()
+
+async def reload_products() -> CatalogStore:
+    """
+    Rebuild the catalog in a worker thread, then swap it in.
+
+    The swap is a single assignment on the event loop. Handlers read `catalog` without awaiting
+    in between, so every request sees either the old or the new store, never a mix; streaming
+    exports keep iterating the store they started with.
+    """
+    global catalog, catalog_loaded_mtime
+    async with reload_lock:
+        mtime = catalog_source_mtime()
+        try:
+            store = await run_in_threadpool(build_catalog, False)
+        except Exception:
+            CATALOG_RELOADS.labels("failed").inc()
+            raise
+        CATALOG_RELOADS.labels("succeeded").inc()
+        catalog = store
+        catalog_loaded_mtime = mtime
+    return store
+
+async def watch_catalog_files():
+    """Reload the catalog whenever DATA_FILE or SNAPSHOT_FILE changes on disk"""
+    while True:
+        await asyncio.sleep(CATALOG_WATCH_INTERVAL)
+        if catalog_source_mtime() > catalog_loaded_mtime:
+            print("Catalog files changed, reloading...")
+            try:
+                await reload_products()
+            except Exception as e:
+                print(f"Catalog reload failed, keeping current catalog: {e}")
 
 @app.on_event("startup")
 async def startup_event():
     """Load products on startup"""
+    global watcher_task
     load_products()
+    if CATALOG_WATCH_INTERVAL > 0:
+        watcher_task = asyncio.create_task(watch_catalog_files())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the catalog file watcher"""
+    if watcher_task:
+        watcher_task.cancel()
+
+@app.post("/admin/reload")
+async def admin_reload(x_admin_token: Optional[str] = Header(None)):
+    """
+    Reload the catalog from disk without downtime
+    
+    Requires the `X-Admin-Token` header to match PRODUCT_API_ADMIN_TOKEN; the endpoint is
+    disabled when that is not set.
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (PRODUCT_API_ADMIN_TOKEN is not set)")
+    if not hmac.compare_digest((x_admin_token or "").encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    try:
+        store = await reload_products()
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=500, detail=f"Catalog reload failed: {e}")
+    return {"status": "reloaded", "total_products": len(store)}
 
 @app.get("/")
 async def root():
@@ -116,69 +329,155 @@ async def root():
         "endpoints": {
             "get_all_products": "/get-all-products",
             "get_product_by_id": "/get-product-by-id/{product_id}",
-            "get_products_by_service_location": "/get-products-by-service-location-id/{service_location_id}"
+            "get_products_by_service_location": "/get-products-by-service-location-id/{service_location_id}",
+            "get_products_by_product_group": "/get-products-by-product-group/{product_group}",
+            "export_products": "/export-products"
         },
-        "total_products": len(products_data)
+        "total_products": len(catalog)
     }
 
-@app.get("/get-all-products", response_model=List[Product])
+@app.get("/get-all-products", response_model=Union[List[Product], ProductPage])
 async def get_all_products(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Number of records to return")
+    limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION)
 ):
     """
     Get all products with pagination
     
     - **skip**: Number of records to skip (default: 0)
     - **limit**: Maximum number of records to return (default: 100, max: 1000)
+    - **cursor**: Switches to cursor pagination ordered by productId. The response becomes
+      `{"items": [...], "next_cursor": "..."}`; `next_cursor` is null on the last page
     """
-    return products_data[skip:skip + limit]
+    if cursor is not None:
+        return to_page(*catalog.page_after(decode_cursor(cursor), limit))
+    return to_list(catalog.page(skip, limit))
 
 @app.get("/get-product-by-id/{product_id}", response_model=Product)
 async def get_product_by_id(product_id: str):
     """
     Get a specific product by its productId (SKU)
     
-    - **product_id**: The product SKU (e.g., SKU-ORG-12345)
+    - **product_id**: The product SKU (e.g., SKU-ORG-12345). The product UUID is also accepted.
     """
-    for product in products_data:
-        if product["productId"] == product_id:
-            return product
+    product = catalog.get(product_id) or catalog.get_by_id(product_id)
+    if product is not None:
+        return product.to_dict()
     
     raise HTTPException(status_code=404, detail=f"Product with ID '{product_id}' not found")
 
-@app.get("/get-products-by-service-location-id/{service_location_id}", response_model=List[Product])
+@app.get("/get-products-by-service-location-id/{service_location_id}", response_model=Union[List[Product], ProductPage])
 async def get_products_by_service_location_id(
     service_location_id: int,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Number of records to return")
+    limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    product_group: Optional[str] = Query(None, description="Only products in this group (case-insensitive)")
 ):
     """
     Get all products for a specific service location with pagination
     
     - **service_location_id**: The service location ID (e.g., 10020030)
+    - **product_group**: Only return products in this group, case-insensitive (e.g., Dairy)
     - **skip**: Number of records to skip (default: 0)
     - **limit**: Maximum number of records to return (default: 100, max: 1000)
+    - **cursor**: Switches to cursor pagination ordered by productId (see /get-all-products)
     """
-    filtered_products = [
-        product for product in products_data 
-        if product["serviceLocationId"] == service_location_id
-    ]
-    
-    if not filtered_products:
+    if not catalog.has_location(service_location_id):
         raise HTTPException(
             status_code=404, 
             detail=f"No products found for service location ID '{service_location_id}'"
         )
     
-    return filtered_products[skip:skip + limit]
+    if product_group is not None:
+        if not catalog.has_location_group(service_location_id, product_group):
+            raise HTTPException(
+                status_code=404,
+                detail=f"No products found for product group '{product_group}' at service location ID '{service_location_id}'"
+            )
+        if cursor is not None:
+            return to_page(*catalog.page_by_location_group_after(
+                service_location_id, product_group, decode_cursor(cursor), limit
+            ))
+        return to_list(catalog.page_by_location_group(service_location_id, product_group, skip, limit))
+
+    if cursor is not None:
+        return to_page(*catalog.page_by_location_after(service_location_id, decode_cursor(cursor), limit))
+    return to_list(catalog.page_by_location(service_location_id, skip, limit))
+
+@app.get("/get-products-by-product-group/{product_group}", response_model=Union[List[Product], ProductPage])
+async def get_products_by_product_group(
+    product_group: str,
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION)
+):
+    """
+    Get all products in a product group with pagination
+    
+    - **product_group**: The product group, case-insensitive (e.g., Dairy)
+    - **skip**: Number of records to skip (default: 0)
+    - **limit**: Maximum number of records to return (default: 100, max: 1000)
+    - **cursor**: Switches to cursor pagination ordered by productId (see /get-all-products)
+    """
+    if not catalog.has_group(product_group):
+        raise HTTPException(
+            status_code=404, 
+            detail=f"No products found for product group '{product_group}'"
+        )
+    
+    if cursor is not None:
+        return to_page(*catalog.page_by_group_after(product_group, decode_cursor(cursor), limit))
+    return to_list(catalog.page_by_group(product_group, skip, limit))
+
+def ndjson_chunks(rows, compress: bool = False):
+    """Encode rows as NDJSON, yielding one chunk per EXPORT_CHUNK_ROWS rows"""
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    encoder = json.JSONEncoder(separators=(",", ":"))
+    lines = []
+    for row in rows:
+        lines.append(encoder.encode(row.to_dict()))
+        if len(lines) >= EXPORT_CHUNK_ROWS:
+            chunk = ("\n".join(lines) + "\n").encode()
+            lines.clear()
+            yield compressor.compress(chunk) if compressor else chunk
+    if lines:
+        chunk = ("\n".join(lines) + "\n").encode()
+        yield compressor.compress(chunk) if compressor else chunk
+    if compressor:
+        yield compressor.flush()
+
+@app.get("/export-products")
+async def export_products(
+    service_location_id: Optional[int] = Query(None, description="Only export products at this service location"),
+    product_group: Optional[str] = Query(None, description="Only export products in this group (case-insensitive)"),
+    gzip: bool = Query(False, description="Gzip-compress the stream")
+):
+    """
+    Stream the catalog as newline-delimited JSON, one product per line
+    
+    - **service_location_id**: Optional service location filter
+    - **product_group**: Optional product group filter
+    - **gzip**: Compress the stream (sent with `Content-Encoding: gzip`)
+    """
+    rows = catalog.iter_rows(service_location_id, product_group)
+    headers = {"Content-Disposition": 'attachment; filename="products.ndjson"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(ndjson_chunks(rows, gzip), media_type="application/x-ndjson", headers=headers)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheus metrics"""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "total_products": len(products_data),
+        "total_products": len(catalog),
         "service_locations": SERVICE_LOCATIONS
     }
 
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Measure get_products tool latency with a fresh httpx client per call (the old behaviour)
+versus the pooled process-lifetime client.
+
+Starts the Product API on a local port with uvicorn, then calls call_tool directly. Both
+modes run the full call_tool (request and result encoding); only the client differs. The
+response cache is disabled so every call reaches the backend.
+
+Usage (from apis/product-api/mcp-server):
+    python benchmarks/bench_call_tool.py [--calls 500] [--concurrency 10]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+MCP_DIR = Path(__file__).resolve().parent.parent
+API_DIR = MCP_DIR.parent
+sys.path.insert(0, str(MCP_DIR))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_product_api(port: int):
+    """Run the Product API in a background thread and wait until it answers"""
+    import httpx
+    import uvicorn
+
+    os.chdir(API_DIR)
+    sys.path.insert(0, str(API_DIR))
+    import main as product_api
+
+    server = uvicorn.Server(uvicorn.Config(product_api.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    for _ in range(200):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health")
+            return server
+        except httpx.TransportError:
+            time.sleep(0.05)
+    raise RuntimeError("Product API did not start")
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(call, calls: int, concurrency: int):
+    """Return per-call latencies in milliseconds"""
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await call()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return latencies
+
+
+class PerCallClient:
+    """What call_tool did before: a new client (and connection) for every backend request"""
+
+    def __init__(self, create_http_client):
+        self.create_http_client = create_http_client
+
+    async def get(self, *args, **kwargs):
+        async with self.create_http_client() as client:
+            return await client.get(*args, **kwargs)
+
+
+async def benchmark(calls: int, concurrency: int):
+    import server
+
+    pooled_client = server.get_http_client()
+    per_call_client = PerCallClient(server.create_http_client)
+
+    async def call():
+        await server.call_tool("get_products", {})
+
+    print(f"{'mode':<16} {'p50 (ms)':>9} {'p99 (ms)':>9} {'mean (ms)':>10}")
+    for name, client in (("per-call client", per_call_client), ("pooled client", pooled_client)):
+        server.get_http_client = lambda client=client: client
+        await run(call, min(calls, 20), concurrency)
+        latencies = await run(call, calls, concurrency)
+        print(f"{name:<16} {statistics.median(latencies):>9.2f} {percentile(latencies, 99):>9.2f} {statistics.mean(latencies):>10.2f}")
+
+    await pooled_client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MCP tool latency against a local Product API")
+    parser.add_argument("--calls", type=int, default=500, help="Tool calls per mode")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent in-flight calls")
+    args = parser.parse_args()
+
+    port = free_port()
+    os.environ["PRODUCT_API_URL"] = f"http://127.0.0.1:{port}"
+    # Measure backend calls, not response cache hits (read when server is imported)
+    os.environ["MCP_CACHE_TTL"] = "0"
+    start_product_api(port)
+    asyncio.run(benchmark(args.calls, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
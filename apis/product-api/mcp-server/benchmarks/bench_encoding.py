@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Compare the size of tool results per output encoding on the 10k fixture.
+
+Token counts use tiktoken (o200k_base) when it is installed and its encoding can be
+loaded; otherwise they are estimated as bytes / 4 and marked with '~'.
+
+Usage (from apis/product-api/mcp-server):
+    python benchmarks/bench_encoding.py
+"""
+
+import json
+import sys
+from pathlib import Path
+
+MCP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(MCP_DIR))
+
+from encoding import encode_rows  # noqa: E402
+
+DATA_FILE = MCP_DIR.parent / "products_10k.json"
+
+
+def token_counter():
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("o200k_base")
+        return lambda text: (len(encoding.encode(text)), "")
+    except Exception:
+        return lambda text: (len(text.encode("utf-8")) // 4, "~")
+
+
+def main():
+    rows = json.loads(DATA_FILE.read_text())
+    count_tokens = token_counter()
+
+    cases = [
+        ("repr (previous)", dict(format="repr")),
+        ("json", dict(format="json")),
+        ("table", dict(format="table")),
+        ("table, 3 fields", dict(format="table", fields=["productId", "name", "price"])),
+    ]
+
+    for label, size in (("100 rows", 100), ("10k rows", len(rows))):
+        print(f"\n{label}")
+        print(f"  {'encoding':<18} {'bytes':>10} {'tokens':>10}")
+        for name, options in cases:
+            text = encode_rows(rows[:size], **options)
+            tokens, marker = count_tokens(text)
+            print(f"  {name:<18} {len(text.encode('utf-8')):>10} {marker + str(tokens):>10}")
+
+    text = encode_rows(rows, format="table", max_bytes=32000)
+    tokens, marker = count_tokens(text)
+    print(f"\n10k rows, table with 32000-byte budget: {len(text.encode('utf-8'))} bytes, {marker}{tokens} tokens")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Measure what an agent sees when it calls get_products through the SSE+POST transport.
+
+Each simulated agent opens its own MCP session over SSE, initializes, lists tools and then
+calls get_products in a loop with varying arguments, like an agent paging through the
+catalog. Latency is reported per phase (connect, initialize, list_tools, call_tool) along
+with tool-call throughput. The Product API and the MCP server run on local ports in this
+process, so the server-side share of each call is also split into the backend request and
+result encoding.
+
+Each variant changes one thing on the same servers:
+    pooled/json      the shipped configuration
+    pooled/repr      str(data) results instead of compact JSON
+    per-call/json    a new httpx client (and connection) for every backend request
+    per-call/repr    both, i.e. the original behaviour
+
+The response cache is disabled by default (--cache-ttl) so every call reaches the backend.
+
+Usage (from apis/product-api/mcp-server):
+    python benchmarks/bench_sessions.py [--sessions 20] [--calls 20]
+                                        [--variants pooled/json,per-call/repr] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+MCP_DIR = Path(__file__).resolve().parent.parent
+API_DIR = MCP_DIR.parent
+sys.path.insert(0, str(MCP_DIR))
+
+VARIANTS = ("pooled/json", "pooled/repr", "per-call/json", "per-call/repr")
+PHASES = ("connect", "initialize", "list_tools", "call_tool", "server: backend", "server: encode")
+CATEGORIES = ("Produce", "Dairy", "Bakery", "Meat", "Pantry", "Beverages", "Frozen")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve(app, port: int):
+    """Run an ASGI app with uvicorn in a background thread and wait until it accepts connections"""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    for _ in range(200):
+        if server.started:
+            return server
+        time.sleep(0.05)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class PerCallClient:
+    """Stands in for the pooled client: every request opens and closes its own httpx client"""
+
+    def __init__(self, server):
+        self.create_http_client = server.create_http_client
+
+    async def get(self, *args, **kwargs):
+        async with self.create_http_client() as client:
+            return await client.get(*args, **kwargs)
+
+
+def instrument(server, timings):
+    """Time the backend fetch and result encoding inside the server's call_tool"""
+    fetch_backend, encode_rows = server.fetch_backend, server.encode_rows
+
+    async def timed_fetch(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await fetch_backend(*args, **kwargs)
+        finally:
+            timings["server: backend"].append((time.perf_counter() - start) * 1000)
+
+    def timed_encode(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return encode_rows(*args, **kwargs)
+        finally:
+            timings["server: encode"].append((time.perf_counter() - start) * 1000)
+
+    server.fetch_backend, server.encode_rows = timed_fetch, timed_encode
+
+
+def tool_arguments(rng: random.Random, locations, result_format: str) -> dict:
+    """Arguments an agent might send: a location, a category or both, at various page sizes"""
+    arguments = {"format": result_format, "limit": rng.choice((10, 50, 100))}
+    choice = rng.random()
+    if choice < 0.4:
+        arguments["location_id"] = rng.choice(locations)
+    if choice > 0.3:
+        arguments["category"] = rng.choice(CATEGORIES)
+    return arguments
+
+
+async def agent(url: str, calls: int, result_format: str, locations, seed: int, timings, sizes):
+    """One session: connect, initialize, list_tools, then ``calls`` get_products calls"""
+    from mcp import ClientSession
+    from mcp.client.sse import sse_client
+
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    async with sse_client(url) as (read, write):
+        timings["connect"].append((time.perf_counter() - start) * 1000)
+        async with ClientSession(read, write) as session:
+            for phase, call in (("initialize", session.initialize), ("list_tools", session.list_tools)):
+                start = time.perf_counter()
+                await call()
+                timings[phase].append((time.perf_counter() - start) * 1000)
+            for _ in range(calls):
+                start = time.perf_counter()
+                result = await session.call_tool("get_products", tool_arguments(rng, locations, result_format))
+                timings["call_tool"].append((time.perf_counter() - start) * 1000)
+                sizes.append(len(result.content[0].text.encode("utf-8")))
+
+
+async def run_variant(server, url: str, variant: str, args, locations) -> dict:
+    client_mode, result_format = variant.split("/")
+    server.response_cache.clear()
+
+    timings, sizes = defaultdict(list), []
+    get_http_client, fetch_backend, encode_rows = server.get_http_client, server.fetch_backend, server.encode_rows
+    if client_mode == "per-call":
+        server.get_http_client = lambda: PerCallClient(server)
+    instrument(server, timings)
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            agent(url, args.calls, result_format, locations, args.seed + i, timings, sizes)
+            for i in range(args.sessions)
+        ))
+    finally:
+        server.get_http_client, server.fetch_backend, server.encode_rows = get_http_client, fetch_backend, encode_rows
+    elapsed = time.perf_counter() - start
+
+    phases = {
+        phase: {
+            "count": len(timings[phase]),
+            "mean_ms": statistics.mean(timings[phase]),
+            "p50_ms": percentile(timings[phase], 50),
+            "p95_ms": percentile(timings[phase], 95),
+            "p99_ms": percentile(timings[phase], 99),
+        }
+        for phase in PHASES if timings[phase]
+    }
+    return {
+        "variant": variant,
+        "sessions": args.sessions,
+        "calls_per_session": args.calls,
+        "seconds": elapsed,
+        "calls_per_second": len(timings["call_tool"]) / elapsed,
+        "mean_result_bytes": statistics.mean(sizes) if sizes else 0,
+        "phases": phases,
+    }
+
+
+def print_variant(result: dict) -> None:
+    print(f"\n{result['variant']}: {result['calls_per_second']:.0f} calls/s, "
+          f"{result['mean_result_bytes']:.0f} bytes/result, {result['seconds']:.1f}s")
+    print(f"  {'phase':<16} {'count':>6} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for phase, stats in result["phases"].items():
+        print(f"  {phase:<16} {stats['count']:>6} {stats['mean_ms']:>8.2f} {stats['p50_ms']:>8.2f} "
+              f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
+
+
+async def benchmark(mcp_url: str, args):
+    import server
+    import main as product_api
+
+    locations = [location for location in product_api.SERVICE_LOCATIONS if product_api.catalog.has_location(location)]
+    # Warm up connections, the catalog and the ETag cache outside the measurements
+    warmup = argparse.Namespace(**{**vars(args), "sessions": 2, "calls": 5})
+    await run_variant(server, mcp_url, "pooled/json", warmup, locations)
+
+    results = []
+    for variant in args.variants.split(","):
+        results.append(await run_variant(server, mcp_url, variant, args, locations))
+        print_variant(results[-1])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MCP sessions end to end against a local Product API")
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent MCP sessions")
+    parser.add_argument("--calls", type=int, default=20, help="get_products calls per session")
+    parser.add_argument("--variants", default=",".join(VARIANTS), help=f"Comma-separated from {', '.join(VARIANTS)}")
+    parser.add_argument("--cache-ttl", default="0", help="MCP_CACHE_TTL for the MCP server (default: 0, cache off)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the simulated agents' arguments")
+    parser.add_argument("--output", help="Also write the results as JSON to this path")
+    args = parser.parse_args()
+
+    unknown = set(args.variants.split(",")) - set(VARIANTS)
+    if unknown:
+        parser.error(f"unknown variant(s): {', '.join(sorted(unknown))}")
+    output = Path(args.output).resolve() if args.output else None
+
+    api_port, mcp_port = free_port(), free_port()
+    os.environ["PRODUCT_API_URL"] = f"http://127.0.0.1:{api_port}"
+    os.environ["MCP_CACHE_TTL"] = args.cache_ttl
+    os.chdir(API_DIR)
+    sys.path.insert(0, str(API_DIR))
+    import main as product_api
+    import server
+
+    serve(product_api.app, api_port)
+    serve(server.app, mcp_port)
+    results = asyncio.run(benchmark(f"http://127.0.0.1:{mcp_port}/mcp", args))
+
+    if output:
+        with open(output, "w") as f:
+            json.dump({"cpus": os.cpu_count(), "cache_ttl": args.cache_ttl, "results": results}, f, indent=2)
+        print(f"\nWrote {output}")
+
+
+if __name__ == "__main__":
+    main()
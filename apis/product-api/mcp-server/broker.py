@@ -0,0 +1,207 @@
+import asyncio
+import json
+import os
+import re
+import tempfile
+import uuid
+from typing import Awaitable, Callable, Optional, Tuple
+
+try:
+    import redis.asyncio as redis
+except ImportError:
+    redis = None
+
+# Result of delivering a POSTed message to its session: (HTTP status, JSON body),
+# or None when the session does not exist.
+Delivery = Optional[Tuple[int, dict]]
+Deliver = Callable[[str, dict], Awaitable[Delivery]]
+
+BROKERS = ("local", "unix", "redis")
+
+_WORKER_ID = re.compile(r"^[0-9a-f]{8}$")
+
+
+class SessionBroker:
+    """
+    Routes a POSTed message to the worker that owns the session's SSE stream.
+
+    Session ids are "<worker id>-<random hex>", so any worker can tell who owns a session
+    without a shared registry. Messages for this worker are delivered in-process; the
+    subclasses forward the rest.
+    """
+
+    def __init__(self):
+        self.worker_id = uuid.uuid4().hex[:8]
+        self._deliver: Optional[Deliver] = None
+
+    def new_session_id(self) -> str:
+        return f"{self.worker_id}-{uuid.uuid4().hex}"
+
+    @staticmethod
+    def owner(session_id: str) -> Optional[str]:
+        worker_id, _, rest = session_id.partition("-")
+        return worker_id if rest and _WORKER_ID.match(worker_id) else None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, session_id: str, message: dict) -> Delivery:
+        owner = self.owner(session_id)
+        if owner is None:
+            return None
+        if owner == self.worker_id:
+            return await self._deliver(session_id, message)
+        return await self._forward(owner, session_id, message)
+
+    async def _forward(self, owner: str, session_id: str, message: dict) -> Delivery:
+        # The in-process broker only knows its own sessions
+        return None
+
+    async def _deliver_envelope(self, data: bytes) -> Delivery:
+        request = json.loads(data)
+        return await self._deliver(request["session_id"], request["message"])
+
+
+class LocalBroker(SessionBroker):
+    """Single process: every session lives in this worker"""
+
+
+class UnixSocketBroker(SessionBroker):
+    """
+    Workers on one host; each listens on <socket_dir>/<worker id>.sock.
+
+    A forwarded message is one JSON line and the owner answers with one JSON line
+    carrying the delivery result, so 429/410 responses reach the client unchanged.
+    """
+
+    def __init__(self, socket_dir: Optional[str] = None, timeout: float = 10.0):
+        super().__init__()
+        self.socket_dir = socket_dir or os.path.join(tempfile.gettempdir(), "mcp-sessions")
+        self.timeout = timeout
+        self._server = None
+
+    def _path(self, worker_id: str) -> str:
+        return os.path.join(self.socket_dir, f"{worker_id}.sock")
+
+    async def start(self, deliver: Deliver) -> None:
+        await super().start(deliver)
+        os.makedirs(self.socket_dir, exist_ok=True)
+        self._server = await asyncio.start_unix_server(self._handle, path=self._path(self.worker_id))
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        try:
+            os.unlink(self._path(self.worker_id))
+        except FileNotFoundError:
+            pass
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            line = await reader.readline()
+            if line:
+                writer.write(json.dumps(await self._deliver_envelope(line)).encode() + b"\n")
+                await writer.drain()
+        except Exception as e:
+            print(f"Error delivering forwarded message: {e}")
+        finally:
+            writer.close()
+
+    async def _forward(self, owner: str, session_id: str, message: dict) -> Delivery:
+        try:
+            reader, writer = await asyncio.open_unix_connection(self._path(owner))
+        except (FileNotFoundError, ConnectionRefusedError):
+            # The owning worker is gone, and its sessions with it
+            return None
+        try:
+            writer.write(json.dumps({"session_id": session_id, "message": message}).encode() + b"\n")
+            await writer.drain()
+            line = await asyncio.wait_for(reader.readline(), self.timeout)
+        except asyncio.TimeoutError:
+            return 504, {"error": f"Worker {owner} did not answer"}
+        finally:
+            writer.close()
+        result = json.loads(line) if line else None
+        return tuple(result) if result else None
+
+
+class RedisBroker(SessionBroker):
+    """
+    Workers across hosts/pods sharing a Redis (or Redis-compatible) server.
+
+    Each worker subscribes to <prefix>worker:<worker id>. A forwarded message names a
+    reply list; the owner pushes the delivery result there and the sender waits on it.
+    PUBLISH reaching no subscriber means the owning worker is gone.
+    """
+
+    def __init__(self, url: str, prefix: str = "mcp:", timeout: float = 10.0):
+        if redis is None:
+            raise RuntimeError("The redis session broker needs the 'redis' package (pip install redis)")
+        super().__init__()
+        self.url = url
+        self.prefix = prefix
+        self.timeout = timeout
+        self._redis = None
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+
+    def _channel(self, worker_id: str) -> str:
+        return f"{self.prefix}worker:{worker_id}"
+
+    async def start(self, deliver: Deliver) -> None:
+        await super().start(deliver)
+        self._redis = redis.from_url(self.url)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self._channel(self.worker_id))
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe()
+            await self._pubsub.aclose()
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    async def _listen(self) -> None:
+        async for item in self._pubsub.listen():
+            if item["type"] == "message":
+                asyncio.create_task(self._reply(item["data"]))
+
+    async def _reply(self, data: bytes) -> None:
+        try:
+            reply_to = json.loads(data)["reply_to"]
+            result = await self._deliver_envelope(data)
+            await self._redis.rpush(reply_to, json.dumps(result))
+            await self._redis.expire(reply_to, int(self.timeout) + 1)
+        except Exception as e:
+            print(f"Error delivering forwarded message: {e}")
+
+    async def _forward(self, owner: str, session_id: str, message: dict) -> Delivery:
+        reply_to = f"{self.prefix}reply:{uuid.uuid4().hex}"
+        envelope = {"session_id": session_id, "message": message, "reply_to": reply_to}
+        if not await self._redis.publish(self._channel(owner), json.dumps(envelope)):
+            return None
+        item = await self._redis.blpop([reply_to], timeout=self.timeout)
+        if item is None:
+            return 504, {"error": f"Worker {owner} did not answer"}
+        result = json.loads(item[1])
+        return tuple(result) if result else None
+
+
+def create_broker(kind: str = "local", url: Optional[str] = None, socket_dir: Optional[str] = None, timeout: float = 10.0) -> SessionBroker:
+    """Build the session broker selected by MCP_SESSION_BROKER"""
+    if kind == "local":
+        return LocalBroker()
+    if kind == "unix":
+        return UnixSocketBroker(socket_dir, timeout)
+    if kind == "redis":
+        return RedisBroker(url or "redis://localhost:6379/0", timeout=timeout)
+    raise ValueError(f"Unknown session broker '{kind}'. Available: {', '.join(BROKERS)}")
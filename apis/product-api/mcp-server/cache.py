@@ -0,0 +1,119 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# A loader receives the cached ETag (or None) and returns (value, etag),
+# or None when the backend answered 304 Not Modified.
+Loader = Callable[[Optional[str]], Awaitable[Optional[Tuple[Any, Optional[str]]]]]
+
+
+# Arguments the backend matches case-insensitively; all others (cursor, product_id) are exact
+CASE_INSENSITIVE_ARGUMENTS = frozenset({"category"})
+
+
+def normalize_arguments(tool: str, arguments: Optional[dict], case_insensitive=CASE_INSENSITIVE_ARGUMENTS) -> Tuple:
+    """Build a cache key from a tool name and its arguments, ignoring order, empty values and case where the backend does"""
+    items = []
+    for name, value in (arguments or {}).items():
+        if value is None or value == "" or value == []:
+            continue
+        fold = name in case_insensitive
+        if isinstance(value, str):
+            value = value.strip().lower() if fold else value
+        elif isinstance(value, list):
+            value = tuple(sorted(str(v).strip().lower() if fold else str(v) for v in value))
+        items.append((name, value))
+    return (tool, tuple(sorted(items)))
+
+
+class _Entry:
+    __slots__ = ("value", "etag", "expires")
+
+    def __init__(self, value: Any, etag: Optional[str], expires: float):
+        self.value = value
+        self.etag = etag
+        self.expires = expires
+
+
+class ResponseCache:
+    """
+    In-process LRU cache with a per-entry TTL.
+
+    - Concurrent misses for the same key share one load (single-flight).
+    - Expired entries that carry an ETag are revalidated with If-None-Match
+      instead of being refetched.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "revalidated": 0, "evictions": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: Hashable, load: Loader) -> Any:
+        """Return the cached value for ``key``, loading (or revalidating) it when needed"""
+        if not self.enabled:
+            self.stats["misses"] += 1
+            result = await load(None)
+            return result[0]
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires > self._clock():
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry.value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await load(entry.etag if entry is not None else None)
+            if result is None and entry is not None:
+                self.stats["revalidated"] += 1
+                value, etag = entry.value, entry.etag
+            elif result is None:
+                raise RuntimeError("Backend answered 304 without a cached entry")
+            else:
+                self.stats["misses"] += 1
+                value, etag = result
+            self._store(key, value, etag)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def _store(self, key: Hashable, value: Any, etag: Optional[str]) -> None:
+        self._entries[key] = _Entry(value, etag, self._clock() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def snapshot(self) -> dict:
+        """Counters plus current size, for the stats endpoint"""
+        return {**self.stats, "entries": len(self._entries), "max_entries": self.max_entries, "ttl_seconds": self.ttl}
@@ -0,0 +1,117 @@
+import json
+from collections import Counter
+from typing import Callable, Iterable, List, Optional
+
+# Output encodings for tool results
+#   json  - compact JSON array of objects
+#   table - {"columns": [...], "rows": [[...], ...]}; keys are written once instead of per row
+#   repr  - Python repr of the list (the original output, kept for compatibility)
+FORMATS = ("json", "table", "repr")
+
+# Room kept for the envelope ({"truncated": true, "total": ..., "summary": ..., "next_cursor": ...})
+ENVELOPE_RESERVE = 512
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def project(rows: List[dict], fields: Optional[Iterable[str]]) -> List[dict]:
+    """Keep only the requested fields of each row (all fields when ``fields`` is empty)"""
+    if not fields:
+        return rows
+    fields = list(fields)
+    return [{f: row[f] for f in fields if f in row} for row in rows]
+
+
+def summarize(rows: List[dict]) -> dict:
+    """Small aggregate describing rows that did not fit in the size budget"""
+    summary = {}
+    groups = Counter(row["productGroup"] for row in rows if "productGroup" in row)
+    if groups:
+        summary["productGroup_counts"] = dict(groups.most_common())
+    prices = [row["price"] for row in rows if isinstance(row.get("price"), (int, float))]
+    if prices:
+        summary["price_min"] = min(prices)
+        summary["price_max"] = max(prices)
+    return summary
+
+
+def _columns(rows: List[dict]) -> List[str]:
+    columns = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, None)
+    return list(columns)
+
+
+def encode_rows(
+    rows: List[dict],
+    format: str = "json",
+    fields: Optional[Iterable[str]] = None,
+    max_bytes: Optional[int] = None,
+    next_cursor: Optional[str] = None,
+    cursor_for: Optional[Callable[[dict], str]] = None,
+) -> str:
+    """
+    Encode product rows for an LLM, projecting fields and keeping the text within ``max_bytes``.
+
+    When the rows do not fit, as many leading rows as fit are kept and the output notes the
+    total and a summary of everything that matched. For a page of results, ``next_cursor`` is
+    added to the output; if the page had to be truncated, ``cursor_for`` builds a cursor that
+    resumes right after the last row returned so no rows are skipped.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format '{format}'. Available: {', '.join(FORMATS)}")
+
+    source, rows = rows, project(rows, fields)
+    if format == "repr":
+        text = str(rows)
+        suffix = f"\nnext_cursor: {next_cursor}" if next_cursor else ""
+        limit = max_bytes - len(suffix) if max_bytes else None
+        if limit and len(text.encode("utf-8")) > limit:
+            text = text.encode("utf-8")[:limit].decode("utf-8", "ignore")
+        return text + suffix
+
+    columns = _columns(rows) if format == "table" else None
+    if format == "table":
+        parts = [_dumps([row.get(c) for c in columns]) for row in rows]
+    else:
+        parts = [_dumps(row) for row in rows]
+
+    def render(count: int, truncated: bool) -> str:
+        body = "[" + ",".join(parts[:count]) + "]"
+        cursor = next_cursor
+        if truncated and count and cursor_for is not None:
+            cursor = cursor_for(source[count - 1])
+        if format == "table":
+            text = '{"columns":' + _dumps(columns) + ',"rows":' + body
+        elif truncated or cursor:
+            text = '{"items":' + body
+        else:
+            return body
+        if truncated:
+            text += ',"truncated":true,"returned":%d,"total":%d,"summary":%s' % (count, len(rows), _dumps(summarize(rows)))
+        if cursor:
+            text += ',"next_cursor":' + _dumps(cursor)
+        return text + "}"
+
+    text = render(len(parts), False)
+    if not max_bytes or len(text.encode("utf-8")) <= max_bytes:
+        return text
+
+    # Keep the longest prefix of rows that fits alongside the envelope
+    budget = max_bytes - ENVELOPE_RESERVE - (len(_dumps(columns)) if columns else 0)
+    count, used = 0, 2
+    for part in parts:
+        size = len(part.encode("utf-8")) + 1
+        if used + size > budget:
+            break
+        used += size
+        count += 1
+    text = render(count, True)
+    while count and len(text.encode("utf-8")) > max_bytes:
+        # The summary outgrew the reserve; drop rows until the envelope fits
+        count = count * 9 // 10
+        text = render(count, True)
+    return text
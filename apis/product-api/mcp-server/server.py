@@ -1,36 +1,187 @@
 import asyncio
+import base64
+import contextlib
+import importlib.util
 import httpx
 import uvicorn
 import anyio
 import os
+import sys
+import time
+from pathlib import Path
+from urllib.parse import quote
 from starlette.applications import Starlette
-from starlette.responses import JSONResponse, StreamingResponse
+from starlette.responses import JSONResponse, Response, StreamingResponse
 from starlette.routing import Route
 from mcp.server import Server, InitializationOptions
 from mcp.types import Tool, TextContent, JSONRPCMessage
 import mcp.types as types
 from mcp.shared.message import SessionMessage
 
+from broker import create_broker
+from cache import ResponseCache, normalize_arguments
+from encoding import FORMATS, encode_rows
+
+try:
+    import metrics
+except ImportError:
+    # Running from a checkout: the shared module lives in the Product API directory
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    import metrics
+
 # --- 1. Custom SSE Transport Logic ---
-# This ensures we handle the message queues correctly between GET and POST
+# This ensures we handle the message queues correctly between GET and POST.
+# Both queues are bounded. A send that finds its queue full waits up to
+# SEND_TIMEOUT seconds, then the overflow policy decides what happens:
+#   reject     - the POST is answered with 429 and Retry-After (outbound: disconnect)
+#   drop       - the message is discarded and counted
+#   disconnect - the session is closed and its SSE stream ends
+# so one slow client only ever waits on its own queues.
+INBOUND_QUEUE_SIZE = int(os.getenv("MCP_INBOUND_QUEUE_SIZE", "100"))
+OUTBOUND_QUEUE_SIZE = int(os.getenv("MCP_OUTBOUND_QUEUE_SIZE", "100"))
+SEND_TIMEOUT = float(os.getenv("MCP_SEND_TIMEOUT", "5"))
+OVERFLOW_POLICY = os.getenv("MCP_OVERFLOW_POLICY", "reject")
+OVERFLOW_POLICIES = ("reject", "drop", "disconnect")
+
+# Metrics (served on /metrics). With MCP_WORKERS > 1 every worker reports its own.
+SESSIONS_ACTIVE = metrics.gauge("mcp_sessions_active", "Open SSE sessions in this worker")
+SESSIONS_OPENED = metrics.counter("mcp_sessions_opened", "SSE sessions opened")
+QUEUE_DEPTH = metrics.gauge("mcp_queue_depth", "Messages waiting in session queues, summed over sessions", ("direction",))
+QUEUE_OVERFLOWS = metrics.counter("mcp_queue_overflows", "Sends that found a session queue full for the whole send timeout", ("direction",))
+QUEUE_DROPPED = metrics.counter("mcp_queue_dropped", "Messages discarded by the drop overflow policy", ("direction",))
+TOOL_CALL_DURATION = metrics.histogram("mcp_tool_call_duration_seconds", "call_tool duration, by tool and outcome", ("tool", "outcome"))
+BACKEND_DURATION = metrics.histogram("mcp_backend_request_duration_seconds", "Product API request duration (cache misses and revalidations)", ("status",))
+
+class QueueFull(Exception):
+    """The session's inbound queue stayed full for the whole send timeout"""
+
+class SessionDisconnected(Exception):
+    """The session was closed by the disconnect overflow policy"""
+
+class QueueMetrics:
+    __slots__ = ("direction", "capacity", "accepted", "waited", "overflows", "dropped", "high_water")
+
+    def __init__(self, capacity: int, direction: str):
+        self.direction = direction
+        self.capacity = capacity
+        self.accepted = 0
+        self.waited = 0
+        self.overflows = 0
+        self.dropped = 0
+        self.high_water = 0
+
+    def snapshot(self, depth: int) -> dict:
+        return {
+            "depth": depth,
+            "capacity": self.capacity,
+            "high_water": self.high_water,
+            "accepted": self.accepted,
+            "waited": self.waited,
+            "overflows": self.overflows,
+            "dropped": self.dropped
+        }
+
+class _BoundedSendStream:
+    """Write stream handed to the MCP server loop; applies the overflow policy to outbound messages"""
+
+    def __init__(self, transport: "StarletteSSEServerTransport"):
+        self._transport = transport
+
+    async def send(self, message):
+        await self._transport._send_outbound(message)
+
+    async def aclose(self):
+        await self._transport._out_send.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
 class StarletteSSEServerTransport:
-    def __init__(self, endpoint: str):
+    def __init__(
+        self,
+        endpoint: str,
+        session_id: str = None,
+        inbound_size: int = INBOUND_QUEUE_SIZE,
+        outbound_size: int = OUTBOUND_QUEUE_SIZE,
+        send_timeout: float = SEND_TIMEOUT,
+        overflow_policy: str = OVERFLOW_POLICY
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow_policy}'. Available: {', '.join(OVERFLOW_POLICIES)}")
         self.endpoint = endpoint
+        self.session_id = session_id
+        self.send_timeout = send_timeout
+        self.overflow_policy = overflow_policy
+        self.disconnected = False
+        # Background task running the MCP server loop for this session
+        self.server_task = None
         # Streams for incoming messages (Client -> Server)
-        self._in_send, self._in_recv = anyio.create_memory_object_stream(100)
+        self._in_send, self._in_recv = anyio.create_memory_object_stream(inbound_size)
         # Streams for outgoing messages (Server -> Client)
-        self._out_send, self._out_recv = anyio.create_memory_object_stream(100)
+        self._out_send, self._out_recv = anyio.create_memory_object_stream(outbound_size)
+        self.write_stream = _BoundedSendStream(self)
+        self.inbound = QueueMetrics(inbound_size, "inbound")
+        self.outbound = QueueMetrics(outbound_size, "outbound")
 
-    async def handle_post_message(self, message_dict):
-        """Feed a JSON-RPC message from a POST request into the server"""
+    async def _offer(self, stream, item, metrics: QueueMetrics) -> bool:
+        """Queue ``item``, waiting at most send_timeout for room; False if the queue stayed full"""
+        try:
+            stream.send_nowait(item)
+        except anyio.WouldBlock:
+            metrics.waited += 1
+            with anyio.move_on_after(self.send_timeout) as scope:
+                await stream.send(item)
+            if scope.cancelled_caught:
+                metrics.overflows += 1
+                QUEUE_OVERFLOWS.labels(metrics.direction).inc()
+                return False
+        metrics.accepted += 1
+        metrics.high_water = max(metrics.high_water, stream.statistics().current_buffer_used)
+        return True
+
+    async def handle_post_message(self, message_dict) -> str:
+        """
+        Feed a JSON-RPC message from a POST request into the server.
+
+        Returns "accepted" or "dropped"; raises QueueFull or SessionDisconnected when the
+        queue stays full under the reject or disconnect policy.
+        """
+        if self.disconnected:
+            raise SessionDisconnected(f"Session {self.session_id} is disconnected")
         # Parse the dict into the correct MCP JSONRPCMessage type
         try:
             # We use the parsing logic from the SDK to ensure safety
             parsed_msg = types.JSONRPCMessage.model_validate(message_dict)
-            # Wrap in SessionMessage as expected by MCP Session
-            await self._in_send.send(SessionMessage(message=parsed_msg))
         except Exception as e:
             print(f"Error parsing message: {e}")
+            return "accepted"
+
+        # Wrap in SessionMessage as expected by MCP Session
+        if await self._offer(self._in_send, SessionMessage(message=parsed_msg), self.inbound):
+            return "accepted"
+        if self.overflow_policy == "drop":
+            self.inbound.dropped += 1
+            QUEUE_DROPPED.labels("inbound").inc()
+            return "dropped"
+        if self.overflow_policy == "disconnect":
+            self.disconnect()
+            raise SessionDisconnected(f"Session {self.session_id} disconnected: inbound queue full")
+        raise QueueFull(f"Session {self.session_id} inbound queue is full")
+
+    async def _send_outbound(self, message):
+        """Queue a server message for the SSE stream, applying the overflow policy"""
+        if await self._offer(self._out_send, message, self.outbound):
+            return
+        if self.overflow_policy == "drop":
+            self.outbound.dropped += 1
+            QUEUE_DROPPED.labels("outbound").inc()
+            return
+        # Nobody to answer with 429 on this side: a client that stops reading is disconnected
+        self.disconnect()
+        raise anyio.BrokenResourceError(f"Session {self.session_id} disconnected: outbound queue full")
 
     async def sse_generator(self):
         """Yields SSE formatted events for the GET request"""
@@ -38,6 +189,8 @@ class StarletteSSEServerTransport:
         
         async with self._out_recv:
             async for message in self._out_recv:
+                if self.disconnected:
+                    break
                 try:
                     # message is a SessionMessage, we need the inner JSONRPCMessage
                     if isinstance(message, SessionMessage):
@@ -51,7 +204,140 @@ class StarletteSSEServerTransport:
                 except Exception as e:
                     print(f"Error in SSE generator: {e}")
 
-# --- 2. Initialize MCP Server ---
+    def disconnect(self):
+        """Close the session from our side; the SSE stream ends at its next event"""
+        if self.disconnected:
+            return
+        self.disconnected = True
+        print(f"Session {self.session_id} disconnected by overflow policy")
+        if self.server_task:
+            self.server_task.cancel()
+        self._in_send.close()
+        self._out_send.close()
+
+    def snapshot(self) -> dict:
+        """Queue depths and counters, for the session stats endpoint"""
+        return {
+            "session_id": self.session_id,
+            "overflow_policy": self.overflow_policy,
+            "disconnected": self.disconnected,
+            "inbound": self.inbound.snapshot(self._in_send.statistics().current_buffer_used),
+            "outbound": self.outbound.snapshot(self._out_send.statistics().current_buffer_used)
+        }
+
+    async def close(self):
+        """Stop the MCP server loop and close this session's streams"""
+        if self.server_task:
+            self.server_task.cancel()
+        await self._in_send.aclose()
+        await self._out_send.aclose()
+
+# --- 2. Backend HTTP client ---
+# One pooled client per process so tool calls reuse keep-alive connections
+# instead of paying connect (and TLS) setup on every call.
+PRODUCT_API_URL = os.getenv("PRODUCT_API_URL", "http://localhost:8000")
+MAX_CONNECTIONS = int(os.getenv("PRODUCT_API_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("PRODUCT_API_MAX_KEEPALIVE", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("PRODUCT_API_KEEPALIVE_EXPIRY", "30"))
+REQUEST_TIMEOUT = float(os.getenv("PRODUCT_API_TIMEOUT", "10"))
+CONNECT_TIMEOUT = float(os.getenv("PRODUCT_API_CONNECT_TIMEOUT", "5"))
+# HTTP/2 needs the optional 'h2' package and is only negotiated over TLS
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+http_client = None
+
+def create_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=PRODUCT_API_URL,
+        http2=HTTP2_ENABLED,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT)
+    )
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it on first use outside the app lifespan"""
+    global http_client
+    if http_client is None:
+        http_client = create_http_client()
+    return http_client
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    """Open the pooled backend client and start the session broker; undo both on shutdown"""
+    global http_client
+    http_client = create_http_client()
+    await broker.start(deliver_message)
+    try:
+        yield
+    finally:
+        await broker.stop()
+        await http_client.aclose()
+        http_client = None
+
+# Cache of backend responses keyed on normalized tool arguments (MCP_CACHE_TTL=0 disables it)
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("MCP_CACHE_MAX_ENTRIES", "256")),
+    ttl=float(os.getenv("MCP_CACHE_TTL", "30"))
+)
+
+# Tool arguments that only change how a result is rendered, not what is fetched
+PRESENTATION_ARGUMENTS = {"format", "fields", "max_bytes"}
+
+async def fetch_backend(tool: str, arguments: dict, path: str, params: dict = None, headers: dict = None):
+    """GET a Product API route through the response cache, revalidating with the backend's ETag"""
+    key_arguments = {k: v for k, v in arguments.items() if k not in PRESENTATION_ARGUMENTS}
+    async def load(etag):
+        request_headers = {**(headers or {}), **({"If-None-Match": etag} if etag else {})}
+        start = time.perf_counter()
+        status = "error"
+        try:
+            resp = await get_http_client().get(path, params=params, headers=request_headers)
+            status = resp.status_code
+        finally:
+            BACKEND_DURATION.labels(status).observe(time.perf_counter() - start)
+        if resp.status_code == 304:
+            return None
+        resp.raise_for_status()
+        return resp.json(), resp.headers.get("etag")
+
+    return await response_cache.get(normalize_arguments(tool, key_arguments), load)
+
+# Tool result encoding defaults (see encoding.py)
+DEFAULT_FORMAT = os.getenv("MCP_RESULT_FORMAT", "json")
+MAX_RESULT_BYTES = int(os.getenv("MCP_MAX_RESULT_BYTES", "32000"))
+PRODUCT_FIELDS = ["id", "serviceLocationId", "productId", "productGroup", "name", "itemDesc", "price"]
+
+# Page size used when the agent does not pass a limit (the Product API caps pages at 1000)
+DEFAULT_PAGE_LIMIT = int(os.getenv("MCP_DEFAULT_PAGE_LIMIT", "100"))
+MAX_PAGE_LIMIT = 1000
+
+def product_cursor(row: dict) -> str:
+    """Product API cursor that resumes after ``row`` (same encoding as main.encode_cursor)"""
+    return base64.urlsafe_b64encode(row["productId"].encode()).decode().rstrip("=")
+
+def products_request(arguments: dict):
+    """Map get_products arguments onto a Product API route; returns (path, params)"""
+    product_id = arguments.get("product_id")
+    if product_id:
+        return f"/get-product-by-id/{quote(str(product_id), safe='')}", None
+
+    limit = min(max(int(arguments.get("limit") or DEFAULT_PAGE_LIMIT), 1), MAX_PAGE_LIMIT)
+    params = {"limit": limit, "cursor": arguments.get("cursor") or ""}
+    location_id = arguments.get("location_id")
+    category = arguments.get("category")
+    if location_id is not None:
+        if category:
+            params["product_group"] = category
+        return f"/get-products-by-service-location-id/{int(location_id)}", params
+    if category:
+        return f"/get-products-by-product-group/{quote(category, safe='')}", params
+    return "/get-all-products", params
+
+# --- 3. Initialize MCP Server ---
 mcp_server = Server("Product-API-Proxy")
 
 @mcp_server.list_tools()
@@ -59,49 +345,142 @@ async def list_tools():
     return [
         Tool(
             name="get_products",
-            description="Fetch products from backend. Optional category filter.",
+            description=(
+                "Fetch products from backend, one page at a time. Filter by category and/or location_id, "
+                "or look up a single product with product_id. When more results exist the output includes "
+                "next_cursor; pass it back as 'cursor' to get the next page. "
+                "Results are compact JSON by default; use format='table' for a header plus rows, "
+                "and 'fields' to return only the columns you need."
+            ),
             inputSchema={
                 "type": "object",
                 "properties": {
-                    "category": {"type": "string"}
+                    "category": {"type": "string", "description": "Product group, case-insensitive (e.g. Dairy)"},
+                    "location_id": {"type": "integer", "description": "Service location ID (e.g. 10020030)"},
+                    "product_id": {
+                        "type": "string",
+                        "description": "Product SKU (e.g. SKU-ORG-12345) or UUID; returns just that product and ignores the other filters"
+                    },
+                    "cursor": {"type": "string", "description": "next_cursor from the previous page; omit for the first page"},
+                    "limit": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "maximum": MAX_PAGE_LIMIT,
+                        "description": f"Products per page (default {DEFAULT_PAGE_LIMIT})"
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": list(FORMATS),
+                        "description": "json: array of objects; table: columns + rows; repr: legacy Python repr"
+                    },
+                    "fields": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": list(PRODUCT_FIELDS)},
+                        "description": "Only return these product fields"
+                    },
+                    "max_bytes": {
+                        "type": "integer",
+                        "minimum": 1024,
+                        "description": "Size budget for the result; larger results are truncated with a summary"
+                    }
                 }
             }
         )
     ]
 
+# Tool calls slower than this are logged with their trace id (0 disables the log)
+SLOW_CALL_SECONDS = float(os.getenv("MCP_SLOW_CALL_SECONDS", "1"))
+
+def incoming_traceparent():
+    """traceparent the agent sent in the request's _meta, if any"""
+    try:
+        meta = mcp_server.request_context.meta
+    except LookupError:
+        return None
+    return getattr(meta, "traceparent", None) if meta else None
+
+def record_tool_call(tool: str, outcome: str, elapsed: float, traceparent: str):
+    TOOL_CALL_DURATION.labels(tool, outcome).observe(elapsed)
+    if SLOW_CALL_SECONDS and elapsed >= SLOW_CALL_SECONDS:
+        print(f"Slow {tool} call ({outcome}) in {elapsed:.3f}s trace_id={metrics.trace_id(traceparent)}")
+
 @mcp_server.call_tool()
 async def call_tool(name: str, arguments: dict):
     if name == "get_products":
-        category = arguments.get("category")
-        base_url = os.getenv("PRODUCT_API_URL", "http://localhost:8000")
-        url = f"{base_url}/get-all-products"
-        
-        async with httpx.AsyncClient() as client:
+        # The backend request joins the agent's trace, or starts one; the Product API logs
+        # slow requests with the same trace id
+        traceparent = metrics.new_traceparent(incoming_traceparent())
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            path, params = products_request(arguments)
             try:
-                resp = await client.get(url)
-                data = resp.json()
-                
-                if category:
-                    # Filter by productGroup if category is provided
-                    data = [p for p in data if p.get("productGroup", "").lower() == category.lower()]
-                
-                return [TextContent(type="text", text=str(data))]
-            except Exception as e:
-                return [TextContent(type="text", text=f"Backend Error: {e}")]
+                data = await fetch_backend("get_products", arguments, path, params, {"traceparent": traceparent})
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 404:
+                    raise
+                # Unknown product, location or category: report it as a normal, empty answer
+                outcome = "not_found"
+                return [TextContent(type="text", text=e.response.json().get("detail", "No products found"))]
+
+            next_cursor = None
+            if isinstance(data, dict) and "items" in data:
+                data, next_cursor = data["items"], data.get("next_cursor")
+            elif isinstance(data, dict):
+                data = [data]
+
+            text = encode_rows(
+                data,
+                format=arguments.get("format") or DEFAULT_FORMAT,
+                fields=arguments.get("fields"),
+                max_bytes=arguments.get("max_bytes") or MAX_RESULT_BYTES,
+                next_cursor=next_cursor,
+                cursor_for=product_cursor
+            )
+            outcome = "ok"
+            return [TextContent(type="text", text=text)]
+        except Exception as e:
+            return [TextContent(type="text", text=f"Backend Error: {e}")]
+        finally:
+            record_tool_call(name, outcome, time.perf_counter() - start, traceparent)
     
     raise ValueError(f"Unknown tool: {name}")
 
-# --- 3. Starlette Routes ---
-# We store the active transport here. 
-# Note: For production, use a dict mapped by SessionID.
-active_transport = None
+# --- 4. Starlette Routes ---
+# Each SSE connection gets its own transport, keyed by session ID. The endpoint
+# event tells the client which URL to POST to, so concurrent agents never share
+# a queue. Entries are removed when the SSE stream disconnects.
+sessions: dict[str, StarletteSSEServerTransport] = {}
+
+def queue_depth(direction: str) -> int:
+    return sum(
+        (t._in_send if direction == "inbound" else t._out_send).statistics().current_buffer_used
+        for t in list(sessions.values())
+    )
+
+SESSIONS_ACTIVE.set_function(lambda: len(sessions))
+for direction in ("inbound", "outbound"):
+    QUEUE_DEPTH.labels(direction).set_function(lambda direction=direction: queue_depth(direction))
+
+# Sessions live in the worker that serves their SSE stream. With several workers or
+# replicas a POST may land elsewhere, so the broker routes it to the owner:
+#   local - single process (default)
+#   unix  - workers on one host, over Unix sockets in MCP_BROKER_SOCKET_DIR
+#   redis - workers across hosts/pods via MCP_BROKER_URL (needs the 'redis' package)
+SESSION_BROKER = os.getenv("MCP_SESSION_BROKER", "local")
+broker = create_broker(
+    SESSION_BROKER,
+    url=os.getenv("MCP_BROKER_URL"),
+    socket_dir=os.getenv("MCP_BROKER_SOCKET_DIR"),
+    timeout=float(os.getenv("MCP_BROKER_TIMEOUT", "10"))
+)
 
 async def handle_sse(request):
-    global active_transport
-    
-    # 1. Create a new Transport
-    transport = StarletteSSEServerTransport("/mcp")
-    active_transport = transport
+    # 1. Create a new Transport for this session
+    session_id = broker.new_session_id()
+    transport = StarletteSSEServerTransport(f"/mcp?session_id={session_id}", session_id)
+    sessions[session_id] = transport
+    SESSIONS_OPENED.inc()
 
     # 2. Run the MCP Server connection in the background
     # This connects the Server logic (tools) to our Transport queues
@@ -113,36 +492,86 @@ async def handle_sse(request):
         )
     )
 
-    asyncio.create_task(mcp_server.run(
+    transport.server_task = asyncio.create_task(mcp_server.run(
         read_stream=transport._in_recv,
-        write_stream=transport._out_send,
+        write_stream=transport.write_stream,
         initialization_options=init_options
     ))
 
-    # 3. Return the SSE Stream
-    return StreamingResponse(transport.sse_generator(), media_type="text/event-stream")
+    # 3. Return the SSE Stream, unregistering the session once the client goes away
+    async def event_stream():
+        try:
+            async for event in transport.sse_generator():
+                yield event
+        finally:
+            sessions.pop(session_id, None)
+            await transport.close()
+            print(f"Session {session_id} closed ({len(sessions)} active)")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+async def deliver_message(session_id: str, message: dict):
+    """Hand a POSTed message to a session owned by this worker; returns (status, body) or None"""
+    transport = sessions.get(session_id)
+    if not transport:
+        return None
+    try:
+        status = await transport.handle_post_message(message)
+        return 202, {"status": status}
+    except QueueFull as e:
+        return 429, {"error": str(e), "retry_after": max(1, round(transport.send_timeout))}
+    except SessionDisconnected as e:
+        sessions.pop(session_id, None)
+        return 410, {"error": str(e)}
 
 async def handle_messages(request):
-    global active_transport
-    if not active_transport:
-        return JSONResponse({"error": "No active connection"}, status_code=400)
+    session_id = request.query_params.get("session_id")
+    if not session_id:
+        return JSONResponse({"error": "Missing session_id"}, status_code=400)
 
     try:
         body = await request.json()
-        await active_transport.handle_post_message(body)
-        return JSONResponse({"status": "accepted"}, status_code=202)
+        # The broker delivers locally or forwards to the worker that owns the SSE stream
+        result = await broker.publish(session_id, body)
+        if result is None:
+            return JSONResponse({"error": f"Unknown session: {session_id}"}, status_code=404)
+        status_code, payload = result
+        headers = {"Retry-After": str(payload["retry_after"])} if "retry_after" in payload else None
+        return JSONResponse(payload, status_code=status_code, headers=headers)
     except Exception as e:
         print(f"Error handling POST: {e}")
         return JSONResponse({"error": str(e)}, status_code=500)
 
-# --- 4. App Definition ---
+async def handle_cache_stats(request):
+    return JSONResponse(response_cache.snapshot())
+
+async def handle_metrics(request):
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+async def handle_session_stats(request):
+    return JSONResponse({
+        "worker_id": broker.worker_id,
+        "active": len(sessions),
+        "sessions": [transport.snapshot() for transport in sessions.values()]
+    })
+
+# --- 5. App Definition ---
 routes = [
     Route("/mcp", handle_sse, methods=["GET"]),
     Route("/mcp", handle_messages, methods=["POST"]),
+    Route("/cache-stats", handle_cache_stats, methods=["GET"]),
+    Route("/session-stats", handle_session_stats, methods=["GET"]),
+    Route("/metrics", handle_metrics, methods=["GET"]),
 ]
 
-app = Starlette(debug=True, routes=routes)
+app = Starlette(debug=True, routes=routes, lifespan=lifespan)
 
 if __name__ == "__main__":
     # Ensure port matches mcp.json (8001)
-    uvicorn.run(app, host="0.0.0.0", port=8001, log_level="debug")
\ No newline at end of file
+    workers = int(os.getenv("MCP_WORKERS", "1"))
+    if workers > 1 and SESSION_BROKER == "local":
+        raise SystemExit("MCP_WORKERS > 1 needs MCP_SESSION_BROKER=unix or redis so POSTs reach the SSE stream's worker")
+    if workers > 1:
+        uvicorn.run("server:app", host="0.0.0.0", port=8001, log_level="debug", workers=workers)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8001, log_level="debug")
\ No newline at end of file
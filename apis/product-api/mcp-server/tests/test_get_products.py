@@ -0,0 +1,41 @@
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+import httpx
+
+MCP_DIR = Path(__file__).resolve().parent.parent
+API_DIR = MCP_DIR.parent
+sys.path.insert(0, str(MCP_DIR))
+sys.path.insert(0, str(API_DIR))
+os.environ["MCP_CACHE_TTL"] = "0"
+
+import main as product_api  # noqa: E402
+import server  # noqa: E402
+from catalog import CatalogStore  # noqa: E402
+
+
+def call_get_products(arguments: dict) -> str:
+    async def call():
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=product_api.app), base_url="http://product-api")
+        get_http_client = server.get_http_client
+        server.get_http_client = lambda: client
+        try:
+            return await server.call_tool("get_products", arguments)
+        finally:
+            server.get_http_client = get_http_client
+            await client.aclose()
+
+    return asyncio.run(call())[0].text
+
+
+def test_location_and_category_return_a_full_page():
+    with open(API_DIR / "products_10k.json") as f:
+        product_api.catalog = CatalogStore(json.load(f))
+
+    result = json.loads(call_get_products({"location_id": 10020030, "category": "dairy", "limit": 20}))
+    assert len(result["items"]) == 20
+    assert {p["productGroup"] for p in result["items"]} == {"Dairy"}
+    assert result["next_cursor"]
@@ -0,0 +1,180 @@
+"""
+Prometheus metrics and W3C trace context helpers.
+
+Metrics use prometheus_client when it is installed. Otherwise a small built-in
+implementation with the same interface renders the Prometheus text format itself. The
+interface is counter/gauge/histogram with .labels(), .inc(), .set(), .set_function() and
+.observe(). Recording a sample is a dict lookup plus a few additions, so it is cheap
+enough for request hot paths.
+
+Shared by the Product API and the MCP server. The MCP image copies it in (its Dockerfile
+builds from this directory), and server.py falls back to importing it from here when run
+from a checkout.
+"""
+
+import math
+import os
+import re
+from bisect import bisect_left
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = prometheus_client.CONTENT_TYPE_LATEST if prometheus_client else "text/plain; version=0.0.4; charset=utf-8"
+
+# --- Built-in metric types (used without prometheus_client) ---
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class _CounterValue:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def samples(self, name: str):
+        yield f"{name}_total", "", self.value
+
+class _GaugeValue:
+    __slots__ = ("value", "function")
+
+    def __init__(self):
+        self.value = 0.0
+        self.function = None
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the value from ``function`` at scrape time instead"""
+        self.function = function
+
+    def samples(self, name: str):
+        yield name, "", self.function() if self.function else self.value
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # Per-bucket (not cumulative) counts; the last slot is +Inf
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def samples(self, name: str):
+        total = 0
+        for bound, count in zip(self.bounds + (math.inf,), self.counts):
+            total += count
+            yield f"{name}_bucket", f'le="{_format_value(bound)}"', total
+        yield f"{name}_sum", "", self.sum
+        yield f"{name}_count", "", total
+
+class _Metric:
+    def __init__(self, kind: str, name: str, documentation: str, labelnames: Sequence[str], new_value: Callable):
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._new_value = new_value
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._children[()] = new_value()
+
+    def labels(self, *values, **named):
+        key = tuple(str(v) for v in values) if values else tuple(str(named[n]) for n in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children.setdefault(key, self._new_value())
+        return child
+
+    def __getattr__(self, attribute):
+        # Unlabelled metrics record directly: counter.inc(), gauge.set(), histogram.observe()
+        return getattr(self._children[()], attribute)
+
+    def render(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for key, child in list(self._children.items()):
+            for sample, extra, value in child.samples(self.name):
+                yield f"{sample}{_format_labels(self.labelnames, key, extra)} {_format_value(value)}"
+
+_metrics = []
+
+registry = prometheus_client.CollectorRegistry() if prometheus_client else None
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()):
+    """A counter; pass ``name`` without the ``_total`` suffix"""
+    if prometheus_client:
+        return prometheus_client.Counter(name, documentation, labelnames, registry=registry)
+    metric = _Metric("counter", name, documentation, labelnames, _CounterValue)
+    _metrics.append(metric)
+    return metric
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()):
+    if prometheus_client:
+        return prometheus_client.Gauge(name, documentation, labelnames, registry=registry)
+    metric = _Metric("gauge", name, documentation, labelnames, _GaugeValue)
+    _metrics.append(metric)
+    return metric
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+    if prometheus_client:
+        return prometheus_client.Histogram(name, documentation, labelnames, registry=registry, buckets=buckets)
+    bounds = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+    metric = _Metric("histogram", name, documentation, labelnames, lambda: _HistogramValue(bounds))
+    _metrics.append(metric)
+    return metric
+
+def render() -> bytes:
+    """Every metric in the Prometheus text exposition format"""
+    if prometheus_client:
+        return prometheus_client.generate_latest(registry)
+    return ("\n".join(line for metric in _metrics for line in metric.render()) + "\n").encode()
+
+# --- W3C trace context ---
+# A traceparent header is "00-<32 hex trace id>-<16 hex parent span id>-<2 hex flags>".
+# Passing it on from hop to hop lets the logs (or any tracing backend) of every service
+# a tool call touches be joined on the trace id.
+
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+def new_traceparent(parent: Optional[str] = None) -> str:
+    """traceparent for a new span, continuing ``parent``'s trace when it is a valid header"""
+    match = TRACEPARENT.match(parent.strip().lower()) if parent else None
+    trace_id, flags = (match.group(1), match.group(3)) if match else (os.urandom(16).hex(), "01")
+    return f"00-{trace_id}-{os.urandom(8).hex()}-{flags}"
+
+def trace_id(traceparent: Optional[str]) -> Optional[str]:
+    match = TRACEPARENT.match(traceparent.strip().lower()) if traceparent else None
+    return match.group(1) if match else None
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Binary snapshot format for the product catalog.
+
+A snapshot stores the CatalogStore columns back to back so a pod can load the catalog
+without parsing JSON:
+
+    b"PCATSNAP" | uint32 header length | JSON header | column sections (8-byte aligned)
+
+The header lists each column with its typecode and byte length. Fixed-width columns are
+raw array bytes in the writer's byte order; productId values are UTF-8 joined by newlines.
+JSON stays the interchange format, so use this module to convert:
+
+Usage:
+    python snapshot.py products_10k.json products_10k.snapshot
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from catalog import CatalogStore
+
+MAGIC = b"PCATSNAP"
+VERSION = 1
+ALIGNMENT = 8
+
+# (column name, array typecode; None for raw bytes, "str" for newline-joined UTF-8)
+COLUMNS = [
+    ("ids", None),
+    ("product_ids", "str"),
+    ("locations", "q"),
+    ("prices", "d"),
+    ("template_codes", "I"),
+    ("sorted_positions", "I"),
+]
+
+
+def _padding(size: int) -> int:
+    return -size % ALIGNMENT
+
+
+def write_snapshot(store: CatalogStore, path: str) -> int:
+    """Write a catalog snapshot to ``path`` and return its size in bytes"""
+    columns = store.columns()
+    sections = []
+    for name, typecode in COLUMNS:
+        data = columns[name]
+        if typecode == "str":
+            blob = "\n".join(data).encode("utf-8")
+        elif typecode is None:
+            blob = bytes(data)
+        else:
+            blob = array(typecode, data).tobytes()
+        sections.append((name, typecode, blob))
+
+    header = json.dumps({
+        "version": VERSION,
+        "count": len(store),
+        "byteorder": sys.byteorder,
+        "templates": columns["templates"],
+        "columns": [{"name": name, "typecode": typecode, "length": len(blob)} for name, typecode, blob in sections],
+    }).encode("utf-8")
+
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, "wb") as f:
+        prefix = MAGIC + struct.pack("<I", len(header)) + header
+        f.write(prefix + b"\0" * _padding(len(prefix)))
+        for _, _, blob in sections:
+            f.write(blob + b"\0" * _padding(len(blob)))
+    # Replace atomically so a reader never sees a half-written snapshot
+    tmp_path.replace(path)
+    return Path(path).stat().st_size
+
+
+def read_snapshot(path: str) -> CatalogStore:
+    """Load a catalog snapshot written by write_snapshot"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        try:
+            if view[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a catalog snapshot")
+            (header_length,) = struct.unpack_from("<I", view, len(MAGIC))
+            offset = len(MAGIC) + 4
+            header = json.loads(bytes(view[offset:offset + header_length]))
+            if header["version"] != VERSION:
+                raise ValueError(f"Unsupported snapshot version {header['version']} in {path}")
+            offset += header_length
+            offset += _padding(offset)
+
+            columns = {}
+            for column in header["columns"]:
+                section = view[offset:offset + column["length"]]
+                typecode = column["typecode"]
+                if typecode == "str":
+                    text = str(section, "utf-8")
+                    columns[column["name"]] = text.split("\n") if text else []
+                elif typecode is None:
+                    columns[column["name"]] = bytearray(section)
+                else:
+                    values = array(typecode)
+                    values.frombytes(section)
+                    if header["byteorder"] != sys.byteorder:
+                        values.byteswap()
+                    columns[column["name"]] = values
+                section.release()
+                offset += column["length"] + _padding(column["length"])
+        finally:
+            view.release()
+
+    if len(columns["product_ids"]) != header["count"]:
+        raise ValueError(f"Snapshot {path} is truncated or corrupt")
+    return CatalogStore.from_columns(templates=header["templates"], **columns)
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python snapshot.py <products.json> <products.snapshot>")
+        sys.exit(1)
+
+    json_path, snapshot_path = sys.argv[1], sys.argv[2]
+    with open(json_path, "r") as f:
+        store = CatalogStore(json.load(f))
+    size = write_snapshot(store, snapshot_path)
+    print(f"Wrote {len(store)} products to {snapshot_path} ({size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
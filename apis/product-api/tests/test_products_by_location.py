@@ -0,0 +1,45 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+API_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(API_DIR))
+
+import main  # noqa: E402
+from catalog import CatalogStore  # noqa: E402
+
+LOCATION = 10020030
+
+
+@pytest.fixture(scope="module")
+def client():
+    with open(API_DIR / "products_10k.json") as f:
+        main.catalog = CatalogStore(json.load(f))
+    return TestClient(main.app)
+
+
+def test_location_and_group_fill_a_cursor_page(client):
+    params = {"product_group": "dairy", "limit": 20, "cursor": ""}
+    first = client.get(f"/get-products-by-service-location-id/{LOCATION}", params=params).json()
+    assert len(first["items"]) == 20
+    assert {(p["serviceLocationId"], p["productGroup"]) for p in first["items"]} == {(LOCATION, "Dairy")}
+    assert first["next_cursor"]
+
+    params["cursor"] = first["next_cursor"]
+    second = client.get(f"/get-products-by-service-location-id/{LOCATION}", params=params).json()
+    assert second["items"]
+    assert second["items"][0]["productId"] > first["items"][-1]["productId"]
+
+
+def test_location_and_group_skip_page(client):
+    resp = client.get(f"/get-products-by-service-location-id/{LOCATION}", params={"product_group": "Dairy", "limit": 20})
+    assert resp.status_code == 200
+    assert len(resp.json()) == 20
+
+
+def test_location_without_group_is_404(client):
+    resp = client.get(f"/get-products-by-service-location-id/{LOCATION}", params={"product_group": "Nope"})
+    assert resp.status_code == 404
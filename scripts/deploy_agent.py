@@ -4,29 +4,57 @@ Deploy an agent to Azure AI Foundry using the Python SDK.
 
 Usage:
   python scripts/deploy_agent.py <endpoint> <agent_yaml_path>
+  python scripts/deploy_agent.py <endpoint> <agents_dir | "agents/*.yaml">
+
+Passing a directory or a glob deploys every matching agent YAML in batch mode:
+one authenticated client is shared and agents are deployed concurrently.
 
 Environment Variables (alternative to arguments):
   - FOUNDRY_ENDPOINT: Azure AI Foundry project endpoint
     Format: https://<account>.services.ai.azure.com/api/projects/<project-name>
-  - AGENT_YAML_PATH (default: agent.yaml)
+  - AGENT_YAML_PATH (default: agent.yaml); may also be a directory or glob
+  - DEPLOY_MAX_WORKERS: Agents deployed at once in batch mode (default: 4)
+  - DEPLOY_DRY_RUN: Set to 1/true to only print the plan (same as --dry-run)
+
+Deployments are idempotent. Each agent stores a hash of its definition (model, instructions,
+tools) in its metadata. Agents whose hash matches are skipped, changed agents are updated in
+place, and only agents that do not exist yet are created. Use --dry-run to see the plan.
 
 Example:
   python scripts/deploy_agent.py "https://myaccount.services.ai.azure.com/api/projects/my-project" agent.yaml
   
   FOUNDRY_ENDPOINT=https://myaccount.services.ai.azure.com/api/projects/my-project \
   python scripts/deploy_agent.py
+
+  python -m scripts.deploy_agent "https://myaccount.services.ai.azure.com/api/projects/my-project" agents/
+  python -m scripts.deploy_agent "https://myaccount.services.ai.azure.com/api/projects/my-project" agents/ --dry-run
 """
 
 import sys
 import os
+import glob
+import hashlib
+import json
+import time
 import yaml
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Dict, List
 from azure.ai.agents import AgentsClient
 from azure.identity import DefaultAzureCredential, AzureCliCredential
 #from azure.ai.projects.models import ImageBasedHostedAgentDefinition, ProtocolVersionRecord, AgentProtocol
 from azure.ai.projects.models import PromptAgentDefinition
 
+DEFAULT_INSTRUCTIONS = 'You are a helpful assistant that answers general questions'
 
+# Agent metadata key holding the hash of the definition it was deployed from
+DEFINITION_HASH_KEY = 'definition_sha256'
+
+PLAN_DESCRIPTIONS = {
+    'create': 'would create a new agent',
+    'update': 'would update the existing agent in place',
+    'skip': 'unchanged, would skip',
+}
 
 
 def load_agent_yaml(yaml_path: str) -> dict:
@@ -60,32 +88,49 @@ def validate_agent_definition(agent_def: dict) -> None:
 
 
 
-def deploy_agent(
-    endpoint: str,
-    agent_yaml_path: str
-) -> dict:
+def definition_hash(model_id: str, name: str, instructions: str, tools: list) -> str:
+    """SHA-256 of the normalized agent definition (model, name, instructions, built tools)."""
+    normalized = {
+        'model': model_id,
+        'name': name,
+        'instructions': (instructions or '').strip(),
+        'tools': [tool.as_dict() if hasattr(tool, 'as_dict') else tool for tool in tools or []],
+    }
+    encoded = json.dumps(normalized, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def list_deployed_agents(client: AgentsClient) -> Dict[str, object]:
     """
-    Deploy agent to Azure AI Foundry.
+    Index the project's agents by name.
     
-    Args:
-        endpoint: Foundry project endpoint URL
-                 Format: https://<account>.services.ai.azure.com/api/projects/<project-name>
-        agent_yaml_path: Path to agent.yaml definition file
-    
-    Returns:
-        dict: Deployed agent info (id, name, etc.)
-    
-    Raises:
-        Exception: If deployment fails
+    Earlier runs created a new agent every time, so a name may repeat; the most
+    recently created one is treated as the live agent.
     """
-    # Load and validate agent definition
-    print(f"Loading agent from: {agent_yaml_path}")
-    agent_def = load_agent_yaml(agent_yaml_path)
-    validate_agent_definition(agent_def)
+    agents = {}
+    for agent in client.list_agents():
+        current = agents.get(agent.name)
+        if current is None or (agent.created_at and current.created_at and agent.created_at > current.created_at):
+            agents[agent.name] = agent
+    return agents
+
+
+def plan_action(existing, digest: str) -> str:
+    """'create' for new agents, 'skip' when the stored hash matches, 'update' otherwise."""
+    if existing is None:
+        return 'create'
+    if (existing.metadata or {}).get(DEFINITION_HASH_KEY) == digest:
+        return 'skip'
+    return 'update'
+
+
+def create_client(endpoint: str) -> AgentsClient:
+    """
+    Create an authenticated AgentsClient for the Foundry project.
     
-    agent_name = agent_def.get('name', 'Agent')
-    print(f"Agent name: {agent_name}")
-    print(f"Model: {agent_def['model']['id']}")
+    The client is thread-safe, so batch deployments share a single instance
+    (and a single credential/token) across workers.
+    """
     print(f"\nConnecting to Azure AI Foundry:")
     print(f"  Endpoint: {endpoint}")
     
@@ -120,9 +165,53 @@ def deploy_agent(
             print("    3. Your credentials have appropriate permissions")
             raise
     
+    return client
+
+
+def deploy_agent(
+    endpoint: str,
+    agent_yaml_path: str,
+    client: AgentsClient = None,
+    deployed: Dict[str, object] = None,
+    dry_run: bool = False
+) -> dict:
+    """
+    Deploy agent to Azure AI Foundry.
+    
+    The agent is created when no agent with its name exists, updated in place when its
+    definition hash differs from the one stored in the agent's metadata, and left alone
+    otherwise.
+    
+    Args:
+        endpoint: Foundry project endpoint URL
+                 Format: https://<account>.services.ai.azure.com/api/projects/<project-name>
+        agent_yaml_path: Path to agent.yaml definition file
+        client: Authenticated AgentsClient to reuse (created when omitted)
+        deployed: Deployed agents by name, from list_deployed_agents (listed when omitted)
+        dry_run: Only report the planned action
+    
+    Returns:
+        dict: Deployed agent info (id, name, action, etc.)
+    
+    Raises:
+        Exception: If deployment fails
+    """
+    # Load and validate agent definition
+    print(f"Loading agent from: {agent_yaml_path}")
+    agent_def = load_agent_yaml(agent_yaml_path)
+    validate_agent_definition(agent_def)
+    
+    agent_name = agent_def.get('name', 'Agent')
+    print(f"Agent name: {agent_name}")
+    print(f"Model: {agent_def['model']['id']}")
+    
+    if client is None:
+        client = create_client(endpoint)
+    
     # Prepare agent creation parameters
     try:
         model_id = agent_def['model']['id']
+        instructions = agent_def.get('instructions', DEFAULT_INSTRUCTIONS)
         
         # Build tools
         from .tool_factory import build_tools_from_yaml
@@ -130,20 +219,53 @@ def deploy_agent(
         if tools:
             print(f"Attaching {len(tools)} tools to agent...")
 
-        print("Deploying agent to Foundry...")
-        agent = client.create_agent(
-            model=model_id,
-            name=agent_name,
-            instructions=agent_def.get('instructions', 'You are a helpful assistant that answers general questions'),
-            tools=tools
-        )
+        # Compare with what is deployed: create new agents, update changed ones, skip the rest
+        digest = definition_hash(model_id, agent_name, instructions, tools)
+        if deployed is None:
+            deployed = list_deployed_agents(client)
+        existing = deployed.get(agent_name)
+        action = plan_action(existing, digest)
         result = {
-            'id': agent.id,
-            'name': agent.name,
+            'id': existing.id if existing else None,
+            'name': agent_name,
             'model': model_id,
             'endpoint': endpoint,
+            'action': action,
+            DEFINITION_HASH_KEY: digest,
         }
-        print(f"\n✓ Agent deployed successfully!")
+        
+        if dry_run:
+            print(f"\n[dry-run] {agent_name}: {PLAN_DESCRIPTIONS[action]}")
+            return result
+        
+        if action == 'skip':
+            print(f"\n✓ Agent unchanged, nothing to deploy")
+            print(f"  Agent ID: {existing.id}")
+            return result
+        
+        if action == 'update':
+            print(f"Updating agent {existing.id} in Foundry...")
+            metadata = dict(existing.metadata or {})
+            metadata[DEFINITION_HASH_KEY] = digest
+            agent = client.update_agent(
+                existing.id,
+                model=model_id,
+                name=agent_name,
+                instructions=instructions,
+                tools=tools,
+                metadata=metadata
+            )
+        else:
+            print("Deploying agent to Foundry...")
+            agent = client.create_agent(
+                model=model_id,
+                name=agent_name,
+                instructions=instructions,
+                tools=tools,
+                metadata={DEFINITION_HASH_KEY: digest}
+            )
+        result['id'] = agent.id
+        print(f"\n✓ Agent {'updated' if action == 'update' else 'deployed'} successfully!")
         print(f"  Agent ID: {agent.id}")
         print(f"  Agent Name: {agent.name}")
         return result
@@ -154,12 +276,96 @@ def deploy_agent(
         raise
 
 
+def resolve_agent_paths(target: str) -> List[str]:
+    """Expand a YAML file, a directory of agent YAMLs or a glob pattern into sorted paths."""
+    path = Path(target)
+    if path.is_dir():
+        paths = [str(p) for p in path.iterdir() if p.suffix in ('.yaml', '.yml')]
+    elif glob.has_magic(target):
+        paths = glob.glob(target)
+    else:
+        return [target]
+    
+    if not paths:
+        raise FileNotFoundError(f"No agent YAML files match {target}")
+    return sorted(paths)
+
+
+def is_batch_target(target: str) -> bool:
+    return Path(target).is_dir() or glob.has_magic(target)
+
+
+def deploy_agents(
+    endpoint: str,
+    agent_yaml_paths: List[str],
+    max_workers: int = 4,
+    dry_run: bool = False
+) -> List[dict]:
+    """
+    Deploy several agents concurrently with one shared client.
+    
+    Args:
+        endpoint: Foundry project endpoint URL
+        agent_yaml_paths: Agent YAML files to deploy
+        max_workers: Agents deployed at once
+        dry_run: Only report the planned action for each agent
+    
+    Returns:
+        list: One entry per YAML (in input order) with path, status
+              ('deployed' or 'failed'), seconds, and agent info or error
+    """
+    client = create_client(endpoint)
+    # List once for the whole batch instead of once per agent
+    deployed = list_deployed_agents(client)
+    
+    def deploy_one(path: str) -> dict:
+        start = time.perf_counter()
+        try:
+            agent = deploy_agent(endpoint, path, client=client, deployed=deployed, dry_run=dry_run)
+            return {'path': path, 'status': 'deployed', 'agent': agent, 'seconds': time.perf_counter() - start}
+        except Exception as e:
+            return {'path': path, 'status': 'failed', 'error': str(e), 'seconds': time.perf_counter() - start}
+    
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(agent_yaml_paths)))) as pool:
+        futures = {pool.submit(deploy_one, path): path for path in agent_yaml_paths}
+        for future in as_completed(futures):
+            result = future.result()
+            results[result['path']] = result
+            mark = '✓' if result['status'] == 'deployed' else '✗'
+            outcome = result['agent']['action'] if result['status'] == 'deployed' else result['status']
+            print(f"{mark} {result['path']}: {outcome} ({result['seconds']:.1f}s)")
+    
+    return [results[path] for path in agent_yaml_paths]
+
+
+def print_batch_summary(results: List[dict], dry_run: bool = False) -> None:
+    """Print one line per agent plus totals per action."""
+    print("\n" + "="*70)
+    print("Batch Deployment Plan (dry run)" if dry_run else "Batch Deployment Summary")
+    print("="*70)
+    counts = {}
+    for result in results:
+        if result['status'] == 'deployed':
+            outcome = result['agent']['action']
+            detail = f"{result['agent']['name']} ({result['agent']['id'] or 'new'})"
+        else:
+            outcome = 'failed'
+            detail = result['error']
+        counts[outcome] = counts.get(outcome, 0) + 1
+        print(f"  {outcome:<7} {result['seconds']:6.1f}s  {result['path']}: {detail}")
+    
+    print("\n" + ", ".join(f"{counts.get(k, 0)} {k}" for k in ('create', 'update', 'skip', 'failed')))
+
+
 def main():
     """Main entry point."""
     # Get arguments from CLI, environment variables, or prompt user
-    if len(sys.argv) > 1:
-        endpoint = sys.argv[1]
-        agent_yaml_path = sys.argv[2] if len(sys.argv) > 2 else 'agent.yaml'
+    args = [arg for arg in sys.argv[1:] if arg != '--dry-run']
+    dry_run = '--dry-run' in sys.argv[1:] or os.getenv('DEPLOY_DRY_RUN', '').lower() in ('1', 'true', 'yes')
+    if args:
+        endpoint = args[0]
+        agent_yaml_path = args[1] if len(args) > 1 else 'agent.yaml'
     else:
         endpoint = os.getenv('FOUNDRY_ENDPOINT')
         agent_yaml_path = os.getenv('AGENT_YAML_PATH', 'agent.yaml')
@@ -182,9 +388,20 @@ def main():
             
             print()
     
+    if is_batch_target(agent_yaml_path):
+        try:
+            paths = resolve_agent_paths(agent_yaml_path)
+            print(f"Deploying {len(paths)} agents from {agent_yaml_path}")
+            results = deploy_agents(endpoint, paths, max_workers=int(os.getenv('DEPLOY_MAX_WORKERS', '4')), dry_run=dry_run)
+        except Exception as e:
+            print(f"\nDEPLOYMENT FAILED: {e}")
+            sys.exit(1)
+        print_batch_summary(results, dry_run=dry_run)
+        sys.exit(0 if all(r['status'] == 'deployed' for r in results) else 1)
+    
     try:
-        result = deploy_agent(endpoint, agent_yaml_path)
-        print(f"\nDeployment Info:")
+        result = deploy_agent(endpoint, agent_yaml_path, dry_run=dry_run)
+        print(f"\nDeployment Plan:" if dry_run else f"\nDeployment Info:")
         for key, value in result.items():
             print(f"  {key}: {value}")
         sys.exit(0)
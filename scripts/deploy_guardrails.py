@@ -2,163 +2,153 @@
 """
 Deploy AI Foundry Guardrails (Content Filters) to Azure.
 
+Several environments (and resource groups) can be deployed in one run. The Bicep template is
+compiled once, and what-if plus deployment run concurrently for every target (see
+deployment_engine.py).
+
 Usage:
     python scripts/deploy_guardrails.py nonprod
     python scripts/deploy_guardrails.py prod
+    python scripts/deploy_guardrails.py nonprod prod=rg-prod-east,rg-prod-west
+    python scripts/deploy_guardrails.py nonprod prod --what-if-only
+
+Resource groups:
+    <env>=<rg>[,<rg>...] on the command line, else AZURE_RESOURCE_GROUP_<ENV>,
+    else AZURE_RESOURCE_GROUP (default: ad-usa-poc).
+
+Parameters:
+    infrastructure/parameters/guardrails/guardrails.<env>.bicepparam when it exists,
+    else infrastructure/parameters/guardrails/guardrails.bicepparam.
 """
 
-import sys
+import argparse
+import asyncio
 import os
-import subprocess
+import sys
 from pathlib import Path
+from typing import List
+
+try:
+    from .deployment_engine import DeploymentEngine, DeploymentTarget, LocalTransport, print_results
+except ImportError:
+    from deployment_engine import DeploymentEngine, DeploymentTarget, LocalTransport, print_results
+
+PROJECT_ROOT = Path(__file__).parent.parent
+BICEP_FILE = PROJECT_ROOT / 'infrastructure' / 'modules' / 'guardrails' / 'content_filter.bicep'
+PARAMETERS_DIR = PROJECT_ROOT / 'infrastructure' / 'parameters' / 'guardrails'
+
 
+def parameters_file(environment: str) -> Path:
+    """Environment-specific parameters when present, else the shared guardrails.bicepparam"""
+    specific = PARAMETERS_DIR / f'guardrails.{environment}.bicepparam'
+    return specific if specific.exists() else PARAMETERS_DIR / 'guardrails.bicepparam'
 
-def deploy_guardrails(environment: str = 'nonprod'):
+
+def resource_groups(environment: str, explicit: str = '') -> List[str]:
+    if explicit:
+        return [rg.strip() for rg in explicit.split(',') if rg.strip()]
+    rg = os.getenv(f'AZURE_RESOURCE_GROUP_{environment.upper()}') or os.getenv('AZURE_RESOURCE_GROUP', 'ad-usa-poc')
+    return [rg]
+
+
+def build_targets(environments: List[str]) -> List[DeploymentTarget]:
+    """Expand 'env' / 'env=rg1,rg2' arguments into one target per (environment, resource group)"""
+    if not BICEP_FILE.exists():
+        raise FileNotFoundError(f"Bicep template not found: {BICEP_FILE}")
+
+    targets = []
+    for spec in environments:
+        environment, _, explicit = spec.partition('=')
+        environment = environment.lower()
+        param_file = parameters_file(environment)
+        if not param_file.exists():
+            raise FileNotFoundError(f"Parameters file not found: {param_file}")
+        for rg in resource_groups(environment, explicit):
+            targets.append(DeploymentTarget(
+                environment=environment,
+                resource_group=rg,
+                template_file=BICEP_FILE,
+                parameters_file=param_file,
+                deployment_name=f"guardrails-{environment}"
+            ))
+    return targets
+
+
+def deploy_guardrails(environment: str = 'nonprod', engine: DeploymentEngine = None) -> bool:
     """
     Deploy guardrails using Bicep templates.
-    
+
     Args:
         environment: Target environment (for deployment naming)
+        engine: Deployment engine to use (az CLI by default)
+
+    Returns:
+        bool: True when every target deployed successfully
     """
-    # Paths
-    project_root = Path(__file__).parent.parent
-    bicep_file = project_root / 'infrastructure' / 'modules' / 'guardrails' / 'content_filter.bicep'
-    param_file = project_root / 'infrastructure' / 'parameters' / 'guardrails' / 'guardrails.bicepparam'
-    
-    if not bicep_file.exists():
-        raise FileNotFoundError(f"Bicep template not found: {bicep_file}")
-    
-    if not param_file.exists():
-        raise FileNotFoundError(f"Parameters file not found: {param_file}")
-    
-    # Get resource group from environment or use default
-    resource_group = os.getenv('AZURE_RESOURCE_GROUP', 'ad-usa-poc')
-    
+    results = asyncio.run(deploy_environments([environment], engine=engine))
+    return all(r.succeeded for r in results)
+
+
+async def deploy_environments(environments: List[str], engine: DeploymentEngine = None, what_if: bool = True, deploy: bool = True):
+    targets = build_targets(environments)
+    engine = engine or DeploymentEngine()
+
     print(f"\n{'='*70}")
     print(f"🛡️  Deploying AI Foundry Guardrails")
     print(f"{'='*70}")
-    print(f"Environment:     {environment}")
-    print(f"Resource Group:  {resource_group}")
-    print(f"Bicep Template:  {bicep_file.name}")
-    print(f"Parameters:      {param_file.name}")
-    print(f"{'='*70}\n")
-    
-    # Step 1: Validate Bicep template
-    print("Step 1: Validating Bicep template...")
-    try:
-        subprocess.run(
-            ['az', 'bicep', 'build', '--file', str(bicep_file)],
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        print("✅ Bicep template is valid\n")
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Bicep validation failed:")
-        print(e.stderr)
-        sys.exit(1)
-    
-    # Step 2: Run what-if analysis
-    print("Step 2: Running what-if analysis...")
-    deployment_name = f"guardrails-{environment}-whatif"
-    
-    try:
-        result = subprocess.run(
-            [
-                'az', 'deployment', 'group', 'what-if',
-                '--resource-group', resource_group,
-                '--template-file', str(bicep_file),
-                '--parameters', str(param_file),
-                '--name', deployment_name
-            ],
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        print(result.stdout)
-    except subprocess.CalledProcessError as e:
-        print(f"⚠️  What-if analysis failed (this might be expected):")
-        print(e.stderr)
-        # Don't exit - what-if can fail for various reasons
-    
-    # Step 3: Deploy
-    print("\nStep 3: Deploying content filter...")
-    deployment_name = f"guardrails-{environment}"
-    
-    try:
-        result = subprocess.run(
-            [
-                'az', 'deployment', 'group', 'create',
-                '--resource-group', resource_group,
-                '--template-file', str(bicep_file),
-                '--parameters', str(param_file),
-                '--name', deployment_name
-            ],
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        
-        print("✅ Deployment completed successfully!")
-        print("\nDeployment outputs:")
-        print(result.stdout)
-        
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Deployment failed:")
-        print(e.stderr)
-        sys.exit(1)
-    
-    # Step 4: Verify deployment
-    print("\nStep 4: Verifying deployment...")
-    try:
-        result = subprocess.run(
-            [
-                'az', 'deployment', 'group', 'show',
-                '--resource-group', resource_group,
-                '--name', deployment_name,
-                '--query', 'properties.provisioningState',
-                '-o', 'tsv'
-            ],
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        
-        status = result.stdout.strip()
-        if status == 'Succeeded':
-            print(f"✅ Deployment verified: {status}")
-        else:
-            print(f"⚠️  Deployment status: {status}")
-            sys.exit(1)
-            
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Verification failed:")
-        print(e.stderr)
-        sys.exit(1)
-    
-    print(f"\n{'='*70}")
-    print(f"✅ Guardrails deployment completed successfully!")
+    for target in targets:
+        print(f"Environment:     {target.environment:<10} Resource Group: {target.resource_group}")
+    print(f"Bicep Template:  {BICEP_FILE.name}")
+    print(f"Parallelism:     {engine.max_concurrency}")
     print(f"{'='*70}\n")
 
+    results = await engine.run(targets, what_if=what_if, deploy=deploy)
+    print_results(results)
+    print(f"Compiled templates: {engine.templates.stats['builds']} built, {engine.templates.stats['hits']} reused")
+    return results
+
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python3 scripts/deploy_guardrails.py [environment]")
-        print("\nEnvironment (optional, defaults to 'nonprod'):")
-        print("  nonprod  - Deploy to non-production")
-        print("  prod     - Deploy to production")
-        print("\nExample:")
-        print("  python3 scripts/deploy_guardrails.py nonprod")
-        sys.exit(1)
-    
-    environment = sys.argv[1].lower() if len(sys.argv) > 1 else 'nonprod'
-    
+    parser = argparse.ArgumentParser(
+        description='Deploy AI Foundry guardrails to one or more environments',
+        epilog='Examples:\n'
+               '  python3 scripts/deploy_guardrails.py nonprod\n'
+               '  python3 scripts/deploy_guardrails.py nonprod prod=rg-prod-east,rg-prod-west',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('environments', nargs='+', help="Environments (nonprod, prod), optionally env=rg1,rg2")
+    parser.add_argument('--what-if-only', action='store_true', help="Run what-if without deploying")
+    parser.add_argument('--skip-what-if', action='store_true', help="Deploy without running what-if first")
+    parser.add_argument('--max-parallel', type=int, default=4, help="Targets processed at once (default: 4)")
+    parser.add_argument('--poll-interval', type=float, default=5.0, help="Seconds between deployment status checks")
+    parser.add_argument('--timeout', type=float, default=1800.0, help="Seconds to wait for each deployment")
+    parser.add_argument('--local', action='store_true', help="Use the in-memory transport (no Azure calls)")
+    args = parser.parse_args()
+
+    engine = DeploymentEngine(
+        transport=LocalTransport() if args.local else None,
+        max_concurrency=args.max_parallel,
+        poll_interval=0.0 if args.local else args.poll_interval,
+        timeout=args.timeout
+    )
     try:
-        deploy_guardrails(environment)
+        results = asyncio.run(deploy_environments(
+            args.environments,
+            engine=engine,
+            what_if=not args.skip_what_if,
+            deploy=not args.what_if_only
+        ))
     except Exception as e:
         print(f"\n❌ Error: {e}")
         sys.exit(1)
 
+    if args.what_if_only:
+        ok = all(r.state == 'WhatIfSucceeded' for r in results)
+    else:
+        ok = all(r.succeeded for r in results)
+    print(f"{'✅' if ok else '❌'} Guardrails deployment {'completed successfully' if ok else 'failed'}")
+    sys.exit(0 if ok else 1)
+
 
 if __name__ == '__main__':
     main()
@@ -2,88 +2,331 @@
 """
 Deploy infrastructure using Bicep parameter files (.bicepparam).
 
-This script deploys infrastructure modules using native Bicep parameter files.
-All configuration is stored in .bicepparam files.
+Modules, their templates, parameter files and dependencies are described in
+infrastructure/stack.yaml (connections → guardrails → agents). Requested modules are
+deployed together with their dependencies; modules whose dependencies have succeeded run
+in parallel, up to --max-parallel at a time.
 
 Usage:
-    python scripts/deploy_infrastructure.py <module> --bicepparam <file>
-    
+    python scripts/deploy_infrastructure.py <module> [<module> ...] [options]
+    python scripts/deploy_infrastructure.py all
+
 Example:
     python scripts/deploy_infrastructure.py foundry_connection --bicepparam infrastructure/parameters/connections/connections.bicepparam
+    python scripts/deploy_infrastructure.py all --policy continue --max-parallel 4
+    python scripts/deploy_infrastructure.py all --what-if-only
 """
 
+import asyncio
+import importlib
+import json
 import os
 import sys
-import subprocess
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import yaml
+
+try:
+    from .deployment_engine import DeploymentEngine, DeploymentTarget, LocalTransport
+except ImportError:
+    from deployment_engine import DeploymentEngine, DeploymentTarget, LocalTransport
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_MANIFEST = PROJECT_ROOT / 'infrastructure' / 'stack.yaml'
+MODULE_KINDS = ('bicep', 'agents')
+POLICIES = ('fail-fast', 'continue')
+
+
+@dataclass
+class Module:
+    name: str
+    kind: str
+    depends_on: List[str] = field(default_factory=list)
+    config: Dict = field(default_factory=dict)
+
+
+@dataclass
+class ModuleResult:
+    name: str
+    status: str  # 'succeeded', 'failed' or 'skipped'
+    seconds: float = 0.0
+    detail: str = ''
+
+
+def load_manifest(path: Path = DEFAULT_MANIFEST) -> Dict[str, Module]:
+    """Read the module manifest and check kinds and dependency names."""
+    with open(path, 'r') as f:
+        raw = yaml.safe_load(f) or {}
+
+    modules = {}
+    for name, cfg in (raw.get('modules') or {}).items():
+        kind = cfg.get('kind', 'bicep')
+        if kind not in MODULE_KINDS:
+            raise ValueError(f"Module '{name}': unknown kind '{kind}'. Available: {', '.join(MODULE_KINDS)}")
+        if kind == 'bicep' and not (cfg.get('template') and cfg.get('parameters')):
+            raise ValueError(f"Module '{name}': bicep modules need 'template' and 'parameters'")
+        modules[name] = Module(name, kind, list(cfg.get('depends_on') or []), cfg)
+
+    for module in modules.values():
+        for dependency in module.depends_on:
+            if dependency not in modules:
+                raise ValueError(f"Module '{module.name}' depends on unknown module '{dependency}'")
+    topological_order(modules)
+    return modules
+
+
+def topological_order(modules: Dict[str, Module]) -> List[str]:
+    """Dependencies before dependents (manifest order among peers); raises on cycles."""
+    order, state = [], {}
+
+    def visit(name: str, path: List[str]):
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ValueError(f"Dependency cycle: {' → '.join(path + [name])}")
+        state[name] = 'visiting'
+        for dependency in modules[name].depends_on:
+            if dependency in modules:
+                visit(dependency, path + [name])
+        state[name] = 'done'
+        order.append(name)
+
+    for name in modules:
+        visit(name, [])
+    return order
+
+
+def select_modules(modules: Dict[str, Module], requested: List[str], with_dependencies: bool = True) -> Dict[str, Module]:
+    """The requested modules ('all' for every module), plus their dependencies unless disabled."""
+    if 'all' in requested:
+        return dict(modules)
+    unknown = [name for name in requested if name not in modules]
+    if unknown:
+        raise ValueError(f"Unknown module: {', '.join(unknown)}. Available: {', '.join(modules)}, all")
+
+    selected, stack = set(), list(requested)
+    while stack:
+        name = stack.pop()
+        if name not in selected:
+            selected.add(name)
+            if with_dependencies:
+                stack.extend(modules[name].depends_on)
+    # Dependencies outside the selection are assumed to be deployed already
+    return {
+        name: Module(m.name, m.kind, [d for d in m.depends_on if d in selected], m.config)
+        for name, m in modules.items() if name in selected
+    }
+
+
+async def run_dag(
+    modules: Dict[str, Module],
+    run_module: Callable[[Module], Awaitable[ModuleResult]],
+    max_parallel: int = 4,
+    policy: str = 'fail-fast'
+) -> Dict[str, ModuleResult]:
+    """
+    Run modules as soon as their dependencies have succeeded, at most max_parallel at once.
+
+    A module whose dependency failed or was skipped is skipped. With 'fail-fast' no new module
+    starts after the first failure (running ones finish); with 'continue' every module that
+    does not depend on a failure still runs.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy '{policy}'. Available: {', '.join(POLICIES)}")
+
+    order = topological_order(modules)
+    results: Dict[str, ModuleResult] = {}
+    pending = list(order)
+    running: Dict[asyncio.Task, str] = {}
+    stopped = False
 
-def deploy_infrastructure(module: str, bicepparam_file: str):
-    """Deploy infrastructure for the given module using Bicep parameter file."""
+    while pending or running:
+        if not stopped:
+            for name in list(pending):
+                blocked = [d for d in modules[name].depends_on if d in results and results[d].status != 'succeeded']
+                if blocked:
+                    results[name] = ModuleResult(name, 'skipped', detail=f"dependency {blocked[0]} {results[blocked[0]].status}")
+                    pending.remove(name)
+                elif all(d in results for d in modules[name].depends_on) and len(running) < max(1, max_parallel):
+                    running[asyncio.create_task(run_module(modules[name]))] = name
+                    pending.remove(name)
+        if not running:
+            break
+
+        done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            name = running.pop(task)
+            results[name] = task.result()
+            if results[name].status == 'failed' and policy == 'fail-fast':
+                stopped = True
+
+    for name in pending:
+        results[name] = ModuleResult(name, 'skipped', detail='not started after an earlier failure (fail-fast)')
+    return {name: results[name] for name in order}
+
+
+class ModuleRunner:
+    """Deploys one manifest module; bicep modules go through the shared DeploymentEngine."""
+
+    def __init__(
+        self,
+        engine: DeploymentEngine,
+        environment: str = 'nonprod',
+        what_if: bool = False,
+        what_if_only: bool = False,
+        offline: bool = False,
+        parameter_overrides: Optional[Dict[str, str]] = None
+    ):
+        self.engine = engine
+        self.environment = environment
+        self.what_if = what_if or what_if_only
+        self.what_if_only = what_if_only
+        self.offline = offline
+        self.parameter_overrides = parameter_overrides or {}
+
+    async def __call__(self, module: Module) -> ModuleResult:
+        start = time.perf_counter()
+        print(f"🚀 [{module.name}] Starting ({module.kind})")
+        try:
+            if module.kind == 'bicep':
+                ok, detail = await self._deploy_bicep(module)
+            else:
+                ok, detail = await self._deploy_agents(module)
+        except Exception as e:
+            ok, detail = False, str(e)
+        result = ModuleResult(module.name, 'succeeded' if ok else 'failed', time.perf_counter() - start, detail)
+        print(f"{'✅' if ok else '❌'} [{module.name}] {result.status} in {result.seconds:.1f}s {detail}")
+        return result
+
+    async def _deploy_bicep(self, module: Module):
+        template = PROJECT_ROOT / module.config['template']
+        parameters = Path(self.parameter_overrides.get(module.name) or PROJECT_ROOT / module.config['parameters'])
+        for path, description in ((template, 'Template'), (parameters, 'Bicep parameters file')):
+            if not path.exists():
+                raise FileNotFoundError(f"{description} not found: {path}")
+
+        target = DeploymentTarget(
+            environment=self.environment,
+            resource_group=module.config.get('resource_group') or os.getenv('RESOURCE_GROUP', 'ad-usa-poc'),
+            template_file=template,
+            parameters_file=parameters,
+            # az names a deployment after its template file by default; keep writing to that history entry
+            deployment_name=module.config.get('deployment_name') or template.stem
+        )
+        result = await self.engine.run_target(target, what_if=self.what_if, deploy=not self.what_if_only)
+        if result.what_if:
+            print(f"[{module.name}] What-if:\n{result.what_if.rstrip()}")
+        if result.succeeded:
+            print(f"[{module.name}] Outputs:\n{json.dumps(result.outputs, indent=2)}")
+        ok = result.state == 'WhatIfSucceeded' if self.what_if_only else result.succeeded
+        return ok, result.error or ''
+
+    async def _deploy_agents(self, module: Module):
+        agents_dir = str(PROJECT_ROOT / module.config.get('agents', 'agents/'))
+        # deploy_agent uses package-relative imports, so load it as scripts.deploy_agent
+        if str(PROJECT_ROOT) not in sys.path:
+            sys.path.insert(0, str(PROJECT_ROOT))
+
+        if self.offline:
+            validate_agents = importlib.import_module('scripts.validate_agents')
+            paths = importlib.import_module('scripts.deploy_agent').resolve_agent_paths(agents_dir)
+            results = await asyncio.to_thread(validate_agents.validate_files, paths, 1)
+            invalid = [r['path'] for r in results if r['status'] != 'valid']
+            return not invalid, f"{len(results) - len(invalid)}/{len(results)} agents valid (offline)"
+
+        endpoint_env = module.config.get('endpoint_env', 'FOUNDRY_ENDPOINT')
+        endpoint = os.getenv(endpoint_env)
+        if not endpoint:
+            raise ValueError(f"Set {endpoint_env} to the Foundry project endpoint to deploy agents")
+        deploy_agent = importlib.import_module('scripts.deploy_agent')
+        paths = deploy_agent.resolve_agent_paths(agents_dir)
+        results = await asyncio.to_thread(
+            deploy_agent.deploy_agents, endpoint, paths,
+            int(os.getenv('DEPLOY_MAX_WORKERS', '4')), self.what_if_only
+        )
+        failed = [r['path'] for r in results if r['status'] != 'deployed']
+        return not failed, f"{len(results) - len(failed)}/{len(results)} agents deployed"
+
+
+def print_summary(results: Dict[str, ModuleResult], elapsed: float) -> None:
+    marks = {'succeeded': '✅', 'failed': '❌', 'skipped': '⏭️ '}
+    print(f"\n📋 Deployment Summary ({elapsed:.1f}s):")
+    for result in results.values():
+        print(f"  {marks[result.status]} {result.name:<22} {result.status:<10} {result.seconds:6.1f}s  {result.detail}")
+
+
+def deploy_infrastructure(module: str, bicepparam_file: str = None) -> bool:
+    """Deploy a single manifest module (without its dependencies), optionally with another Bicep parameters file."""
     print(f"🚀 Deploying infrastructure module: {module}")
-    print(f"📦 Deploying {module} module")
-    print(f"📄 Using Bicep parameters file: {bicepparam_file}")
-    
-    # Validate bicepparam file exists
-    if not Path(bicepparam_file).exists():
-        raise FileNotFoundError(f"Bicep parameters file not found: {bicepparam_file}")
-    
-    # Get resource group from environment or use default
-    resource_group = os.getenv('RESOURCE_GROUP', 'ad-usa-poc')
-    
-    # Determine template to deploy
-    if module == 'foundry_connection':
-        template_file = 'infrastructure/modules/connections/connection.bicep'
-    else:
-        raise ValueError(f"Unknown module: {module}. Available: foundry_connection")
-    
-    if not Path(template_file).exists():
-        raise FileNotFoundError(f"Template not found: {template_file}")
-    
-    print(f"\n📋 Deployment Configuration:")
-    print(f"  Resource Group: {resource_group}")
-    print(f"  Template: {template_file}")
-    print(f"  Parameters: {bicepparam_file}")
-    
-    # Build Azure CLI command with bicepparam file
-    cmd = [
-        'az', 'deployment', 'group', 'create',
-        '--resource-group', resource_group,
-        '--template-file', template_file,
-        '--parameters', bicepparam_file
-    ]
-    
-    print(f"\n🔧 Running deployment...")
-    
-    try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        print(result.stdout)
-        print(f"\n✅ Infrastructure deployed successfully!")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"\n❌ Deployment failed!")
-        print(f"Error: {e.stderr}")
-        return False
+    if bicepparam_file:
+        print(f"📄 Using Bicep parameters file: {bicepparam_file}")
+        if not Path(bicepparam_file).exists():
+            raise FileNotFoundError(f"Bicep parameters file not found: {bicepparam_file}")
+
+    modules = select_modules(load_manifest(), [module], with_dependencies=False)
+    runner = ModuleRunner(DeploymentEngine(), parameter_overrides={module: bicepparam_file} if bicepparam_file else None)
+    results = asyncio.run(run_dag(modules, runner))
+    return all(r.status == 'succeeded' for r in results.values())
+
 
 def main():
     import argparse
     parser = argparse.ArgumentParser(
         description='Deploy infrastructure modules using Bicep parameter files',
         epilog='Examples:\n'
-               '  python scripts/deploy_infrastructure.py foundry_connection --bicepparam infrastructure/parameters/connections.bicepparam',
+               '  python scripts/deploy_infrastructure.py foundry_connection --bicepparam infrastructure/parameters/connections.bicepparam\n'
+               '  python scripts/deploy_infrastructure.py all --policy continue',
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
-    parser.add_argument('module', 
-                        choices=['foundry_connection'],
-                        help='Module to deploy')
+    parser.add_argument('modules',
+                        nargs='+',
+                        help="Modules from the manifest, or 'all'")
     parser.add_argument('--bicepparam',
-                        required=True,
-                        help='Path to Bicep parameter file (.bicepparam)')
-    
+                        help='Path to Bicep parameter file (.bicepparam); only with a single module')
+    parser.add_argument('--manifest', default=str(DEFAULT_MANIFEST),
+                        help='Module manifest (default: infrastructure/stack.yaml)')
+    parser.add_argument('--environment', default='nonprod',
+                        help='Environment name shown in the deployment output (default: nonprod)')
+    parser.add_argument('--no-deps', action='store_true',
+                        help='Deploy only the named modules, not their dependencies')
+    parser.add_argument('--max-parallel', type=int, default=4,
+                        help='Modules deployed at once (default: 4)')
+    parser.add_argument('--policy', choices=POLICIES, default='fail-fast',
+                        help='On failure: stop starting modules (fail-fast) or keep deploying independent ones (continue)')
+    parser.add_argument('--what-if', action='store_true',
+                        help='Run what-if before each Bicep deployment')
+    parser.add_argument('--what-if-only', action='store_true',
+                        help='Only run what-if (agents: dry-run plan)')
+    parser.add_argument('--local', action='store_true',
+                        help='No Azure calls: in-memory Bicep transport and offline agent validation')
+
     args = parser.parse_args()
-    
+
     try:
-        success = deploy_infrastructure(args.module, args.bicepparam)
-        sys.exit(0 if success else 1)
+        if args.bicepparam and len(args.modules) != 1:
+            raise ValueError("--bicepparam can only be used with a single module")
+        modules = select_modules(load_manifest(Path(args.manifest)), args.modules, with_dependencies=not args.no_deps)
+        overrides = {args.modules[0]: args.bicepparam} if args.bicepparam else None
+
+        engine = DeploymentEngine(
+            transport=LocalTransport() if args.local else None,
+            max_concurrency=args.max_parallel,
+            poll_interval=0.0 if args.local else 5.0
+        )
+        runner = ModuleRunner(engine, args.environment, args.what_if, args.what_if_only, args.local, overrides)
+
+        print(f"\n📋 Deployment Configuration:")
+        print(f"  Modules: {' → '.join(topological_order(modules))}")
+        print(f"  Environment: {args.environment}")
+        print(f"  Parallelism: {args.max_parallel} ({args.policy})\n")
+
+        start = time.perf_counter()
+        results = asyncio.run(run_dag(modules, runner, args.max_parallel, args.policy))
+        print_summary(results, time.perf_counter() - start)
+        sys.exit(0 if all(r.status == 'succeeded' for r in results.values()) else 1)
     except Exception as e:
         print(f"\n❌ Error: {e}")
         sys.exit(1)
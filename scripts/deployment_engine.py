@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Concurrent Bicep deployment engine.
+
+- Bicep templates and .bicepparam files are compiled to ARM JSON once per run, keyed by the
+  SHA-256 of their content (including referenced modules and load*Content files), so a run
+  that targets several environments compiles each file a single time. Compiled templates are
+  also kept across runs in a per-user cache, separately per transport; compiled parameters
+  can hold secrets and only live in a private directory for the run.
+- What-if and deployment run concurrently per target (environment + resource group), bounded
+  by max_concurrency. Deployments are started with --no-wait and their provisioning state is
+  polled asynchronously.
+- All Azure access goes through a Transport. AzCliTransport calls the az CLI without blocking
+  the event loop; LocalTransport keeps everything in memory for tests and dry runs.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import weakref
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+TERMINAL_STATES = {'Succeeded', 'Failed', 'Canceled'}
+
+# Files a Bicep source depends on: `using '...'`, `module x '...'` and load*Content('...')
+_REFERENCES = re.compile(r"""(?:^\s*using\s+|^\s*module\s+\w+\s+|load\w*Content\(\s*)'([^']+)'""", re.MULTILINE)
+
+
+class DeploymentError(Exception):
+    """An az command or a deployment failed"""
+
+
+@dataclass
+class DeploymentTarget:
+    environment: str
+    resource_group: str
+    template_file: Path
+    parameters_file: Path
+    deployment_name: str
+
+
+@dataclass
+class DeploymentResult:
+    target: DeploymentTarget
+    state: str = 'NotStarted'
+    what_if: Optional[str] = None
+    outputs: Dict = field(default_factory=dict)
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> bool:
+        return self.state == 'Succeeded'
+
+
+def source_digest(path: Path) -> str:
+    """SHA-256 over a Bicep file and, recursively, every local file it references"""
+    digest = hashlib.sha256()
+    pending, seen = [Path(path).resolve()], set()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        content = current.read_bytes()
+        digest.update(str(current).encode() + b'\0' + content + b'\0')
+        if current.suffix in ('.bicep', '.bicepparam'):
+            for reference in _REFERENCES.findall(content.decode('utf-8', 'ignore')):
+                # Registry/template-spec references (br:, ts:) are versioned remotely
+                if ':' not in reference:
+                    pending.append((current.parent / reference).resolve())
+    return digest.hexdigest()
+
+
+class Transport(ABC):
+    """Azure operations used by the engine; swap in LocalTransport for tests"""
+
+    # Compile cache subdirectory, so output from different transports is never mixed up
+    cache_namespace = 'transport'
+
+    @abstractmethod
+    async def build_template(self, bicep_file: Path) -> dict:
+        ...
+
+    @abstractmethod
+    async def build_parameters(self, bicepparam_file: Path) -> dict:
+        ...
+
+    @abstractmethod
+    async def what_if(self, resource_group: str, name: str, template: Path, parameters: Path) -> str:
+        ...
+
+    @abstractmethod
+    async def begin_deployment(self, resource_group: str, name: str, template: Path, parameters: Path) -> None:
+        ...
+
+    @abstractmethod
+    async def deployment_state(self, resource_group: str, name: str) -> dict:
+        """{'state': provisioningState, 'outputs': {...}, 'error': {...} or None}"""
+        ...
+
+
+class AzCliTransport(Transport):
+    """Runs az as asyncio subprocesses, so several commands are in flight at once"""
+
+    cache_namespace = 'az-cli'
+
+    def __init__(self, az: str = 'az'):
+        self.az = az
+
+    async def _run(self, *args: str) -> str:
+        process = await asyncio.create_subprocess_exec(
+            self.az, *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise DeploymentError(f"az {' '.join(args[:3])} failed: {stderr.decode().strip()}")
+        return stdout.decode()
+
+    async def build_template(self, bicep_file: Path) -> dict:
+        return json.loads(await self._run('bicep', 'build', '--file', str(bicep_file), '--stdout'))
+
+    async def build_parameters(self, bicepparam_file: Path) -> dict:
+        compiled = json.loads(await self._run('bicep', 'build-params', '--file', str(bicepparam_file), '--stdout'))
+        # Newer Bicep versions wrap the parameters file: {"parametersJson": "...", "templateJson": "..."}
+        if 'parametersJson' in compiled:
+            compiled = json.loads(compiled['parametersJson'])
+        return compiled
+
+    async def what_if(self, resource_group: str, name: str, template: Path, parameters: Path) -> str:
+        return await self._run(
+            'deployment', 'group', 'what-if',
+            '--resource-group', resource_group,
+            '--name', name,
+            '--template-file', str(template),
+            '--parameters', f"@{parameters}"
+        )
+
+    async def begin_deployment(self, resource_group: str, name: str, template: Path, parameters: Path) -> None:
+        await self._run(
+            'deployment', 'group', 'create',
+            '--resource-group', resource_group,
+            '--name', name,
+            '--template-file', str(template),
+            '--parameters', f"@{parameters}",
+            '--no-wait'
+        )
+
+    async def deployment_state(self, resource_group: str, name: str) -> dict:
+        return json.loads(await self._run(
+            'deployment', 'group', 'show',
+            '--resource-group', resource_group,
+            '--name', name,
+            '--query', '{state: properties.provisioningState, outputs: properties.outputs, error: properties.error}',
+            '-o', 'json'
+        ))
+
+
+class LocalTransport(Transport):
+    """
+    In-memory transport for tests and dry runs.
+
+    Deployments report Accepted, then Running, then Succeeded after ``polls_to_finish`` polls;
+    resource groups or deployment names listed in ``fail`` end in Failed instead. Every call
+    is recorded in ``calls``.
+    """
+
+    # Placeholder JSON; kept apart from real builds so a later az run never reuses it
+    cache_namespace = 'local'
+
+    def __init__(self, latency: float = 0.0, polls_to_finish: int = 2, fail: Optional[Set[str]] = None):
+        self.latency = latency
+        self.polls_to_finish = polls_to_finish
+        self.fail = set(fail or ())
+        self.calls: List[tuple] = []
+        self.deployments: Dict[tuple, int] = {}
+
+    async def _call(self, *call) -> None:
+        self.calls.append(call)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def build_template(self, bicep_file: Path) -> dict:
+        await self._call('build_template', str(bicep_file))
+        return {'$schema': 'https://schema.management.azure.com/schemas/2019-04-01/deploymentTemplate.json#', 'source': str(bicep_file), 'resources': []}
+
+    async def build_parameters(self, bicepparam_file: Path) -> dict:
+        await self._call('build_parameters', str(bicepparam_file))
+        return {'$schema': 'https://schema.management.azure.com/schemas/2019-04-01/deploymentParameters.json#', 'source': str(bicepparam_file), 'parameters': {}}
+
+    async def what_if(self, resource_group: str, name: str, template: Path, parameters: Path) -> str:
+        await self._call('what_if', resource_group, name)
+        return f"Scope: /resourceGroups/{resource_group}\n\nResource changes: no change ({name}, local transport)."
+
+    async def begin_deployment(self, resource_group: str, name: str, template: Path, parameters: Path) -> None:
+        await self._call('begin_deployment', resource_group, name)
+        self.deployments[(resource_group, name)] = 0
+
+    async def deployment_state(self, resource_group: str, name: str) -> dict:
+        await self._call('deployment_state', resource_group, name)
+        polls = self.deployments[(resource_group, name)] = self.deployments[(resource_group, name)] + 1
+        if polls < self.polls_to_finish:
+            return {'state': 'Accepted' if polls == 1 else 'Running', 'outputs': None, 'error': None}
+        if resource_group in self.fail or name in self.fail:
+            return {'state': 'Failed', 'outputs': None, 'error': {'code': 'LocalFailure', 'message': f"{name} failed in {resource_group}"}}
+        return {'state': 'Succeeded', 'outputs': {}, 'error': None}
+
+
+def default_cache_dir() -> Path:
+    """BICEP_CACHE_DIR, else bicep-cache in the user's cache directory (not the shared temp dir)"""
+    if os.getenv('BICEP_CACHE_DIR'):
+        return Path(os.environ['BICEP_CACHE_DIR'])
+    return Path(os.getenv('XDG_CACHE_HOME') or Path.home() / '.cache') / 'bicep-cache'
+
+
+class CompiledTemplates:
+    """
+    Compiled ARM JSON keyed by source digest; concurrent requests share one build.
+
+    Templates are cached across runs under ``cache_dir/<transport namespace>``. Parameters are
+    written to a private directory (mode 0700) that is removed when this object goes away.
+    """
+
+    def __init__(self, transport: Transport, cache_dir: Optional[str] = None):
+        self.transport = transport
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.templates_dir = self.cache_dir / transport.cache_namespace
+        self.parameters_dir = Path(tempfile.mkdtemp(prefix='bicep-params-'))
+        weakref.finalize(self, shutil.rmtree, str(self.parameters_dir), True)
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.stats = {'hits': 0, 'builds': 0}
+
+    async def template(self, bicep_file: Path) -> Path:
+        return await self._compiled(Path(bicep_file), 'template', self.transport.build_template, self.templates_dir)
+
+    async def parameters(self, bicepparam_file: Path) -> Path:
+        return await self._compiled(Path(bicepparam_file), 'parameters', self.transport.build_parameters, self.parameters_dir)
+
+    async def _compiled(self, source: Path, kind: str, build, directory: Path) -> Path:
+        digest = source_digest(source)
+        target = directory / f"{source.stem}.{digest[:16]}.{kind}.json"
+        lock = self._locks.setdefault(digest + kind, asyncio.Lock())
+        async with lock:
+            if target.exists():
+                self.stats['hits'] += 1
+                return target
+            self.stats['builds'] += 1
+            compiled = await build(source)
+            directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            tmp = target.with_suffix(f".{os.getpid()}.tmp")
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(compiled, f, indent=2)
+            os.replace(tmp, target)
+            return target
+
+
+class DeploymentEngine:
+    """Runs what-if and deployment for many targets concurrently"""
+
+    def __init__(
+        self,
+        transport: Optional[Transport] = None,
+        cache_dir: Optional[str] = None,
+        max_concurrency: int = 4,
+        poll_interval: float = 5.0,
+        timeout: float = 1800.0
+    ):
+        self.transport = transport or AzCliTransport()
+        self.templates = CompiledTemplates(self.transport, cache_dir)
+        self.max_concurrency = max_concurrency
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+    async def run(self, targets: List[DeploymentTarget], what_if: bool = True, deploy: bool = True) -> List[DeploymentResult]:
+        """Deploy every target; results are returned in target order and never raise"""
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def bounded(target: DeploymentTarget) -> DeploymentResult:
+            async with semaphore:
+                return await self.run_target(target, what_if, deploy)
+
+        return list(await asyncio.gather(*(bounded(target) for target in targets)))
+
+    async def run_target(self, target: DeploymentTarget, what_if: bool = True, deploy: bool = True) -> DeploymentResult:
+        result = DeploymentResult(target)
+        label = f"[{target.environment}/{target.resource_group}]"
+        start = time.perf_counter()
+        try:
+            template, parameters = await asyncio.gather(
+                self.templates.template(target.template_file),
+                self.templates.parameters(target.parameters_file)
+            )
+            print(f"{label} ✅ Compiled {target.template_file.name} + {target.parameters_file.name}")
+
+            if what_if:
+                try:
+                    result.what_if = await self.transport.what_if(target.resource_group, f"{target.deployment_name}-whatif", template, parameters)
+                    result.state = 'WhatIfSucceeded'
+                    print(f"{label} ✅ What-if completed")
+                except DeploymentError as e:
+                    # Don't stop - what-if can fail for various reasons
+                    print(f"{label} ⚠️  What-if analysis failed (this might be expected): {e}")
+
+            if deploy:
+                await self.transport.begin_deployment(target.resource_group, target.deployment_name, template, parameters)
+                print(f"{label} 🚀 Deployment {target.deployment_name} started")
+                status = await self.wait_for(target.resource_group, target.deployment_name)
+                result.state = status.get('state') or 'Unknown'
+                result.outputs = status.get('outputs') or {}
+                if status.get('error'):
+                    result.error = json.dumps(status['error'])
+                mark = '✅' if result.succeeded else '❌'
+                print(f"{label} {mark} Deployment {target.deployment_name}: {result.state}")
+        except Exception as e:
+            result.state = 'Failed'
+            result.error = str(e)
+            print(f"{label} ❌ {e}")
+        result.seconds = time.perf_counter() - start
+        return result
+
+    async def wait_for(self, resource_group: str, name: str) -> dict:
+        """Poll a deployment until it reaches a terminal state or the timeout expires"""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            status = await self.transport.deployment_state(resource_group, name)
+            if status.get('state') in TERMINAL_STATES:
+                return status
+            if time.monotonic() >= deadline:
+                raise DeploymentError(f"Deployment {name} still {status.get('state')} after {self.timeout:.0f}s")
+            await asyncio.sleep(self.poll_interval)
+
+
+def print_results(results: List[DeploymentResult]) -> None:
+    for result in results:
+        if result.what_if:
+            print(f"\n[{result.target.environment}/{result.target.resource_group}] What-if:")
+            print(result.what_if.rstrip())
+    print(f"\n{'='*70}")
+    for result in results:
+        mark = '✅' if result.succeeded or result.state == 'WhatIfSucceeded' else '❌'
+        print(f"{mark} {result.target.environment:<10} {result.target.resource_group:<24} {result.state:<16} {result.seconds:6.1f}s")
+        if result.error:
+            print(f"     {result.error}")
+    print(f"{'='*70}\n")
@@ -0,0 +1,100 @@
+"""
+In-process stand-in for the AgentsClient API, for offline validation and tests.
+
+Implements the calls the deployment scripts make (list/get/create/update/delete agents)
+and rejects the same kinds of input the service would: bad names, missing models and
+tools that do not serialize to a typed tool definition. No network access is needed.
+"""
+
+import itertools
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+AGENT_NAME = re.compile(r'^[A-Za-z0-9]([A-Za-z0-9-]{0,61}[A-Za-z0-9])?$')
+MAX_METADATA_KEYS = 16
+MAX_METADATA_VALUE = 512
+MAX_TOOLS = 128
+
+
+@dataclass
+class FakeAgent:
+    id: str
+    name: str
+    model: str
+    instructions: str
+    tools: List[dict]
+    metadata: Dict[str, str]
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class FakeAgentsClient:
+    """Thread-safe fake of azure.ai.agents.AgentsClient holding agents in memory"""
+
+    def __init__(self, endpoint: str = 'offline://foundry', credential=None):
+        self.endpoint = endpoint
+        self.agents: Dict[str, FakeAgent] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def list_agents(self) -> List[FakeAgent]:
+        with self._lock:
+            return list(self.agents.values())
+
+    def get_agent(self, agent_id: str) -> FakeAgent:
+        with self._lock:
+            if agent_id not in self.agents:
+                raise KeyError(f"Agent {agent_id} not found")
+            return self.agents[agent_id]
+
+    def create_agent(self, model: str, name: str, instructions: Optional[str] = None, tools=None, metadata=None, **kwargs) -> FakeAgent:
+        agent = self._build(f"asst_offline_{next(self._ids)}", model, name, instructions, tools, metadata)
+        with self._lock:
+            self.agents[agent.id] = agent
+        return agent
+
+    def update_agent(self, agent_id: str, model: Optional[str] = None, name: Optional[str] = None,
+                     instructions: Optional[str] = None, tools=None, metadata=None, **kwargs) -> FakeAgent:
+        current = self.get_agent(agent_id)
+        agent = self._build(
+            agent_id,
+            model if model is not None else current.model,
+            name if name is not None else current.name,
+            instructions if instructions is not None else current.instructions,
+            tools if tools is not None else current.tools,
+            metadata if metadata is not None else current.metadata
+        )
+        agent.created_at = current.created_at
+        with self._lock:
+            self.agents[agent_id] = agent
+        return agent
+
+    def delete_agent(self, agent_id: str) -> None:
+        with self._lock:
+            self.agents.pop(agent_id, None)
+
+    def _build(self, agent_id, model, name, instructions, tools, metadata) -> FakeAgent:
+        if not isinstance(model, str) or not model.strip():
+            raise ValueError("model is required")
+        if not isinstance(name, str) or not AGENT_NAME.match(name):
+            raise ValueError(f"Invalid agent name {name!r}: use letters, digits and inner hyphens (max 63)")
+        metadata = dict(metadata or {})
+        if len(metadata) > MAX_METADATA_KEYS:
+            raise ValueError(f"metadata allows at most {MAX_METADATA_KEYS} keys")
+        for key, value in metadata.items():
+            if not isinstance(value, str) or len(value) > MAX_METADATA_VALUE:
+                raise ValueError(f"metadata[{key!r}] must be a string of at most {MAX_METADATA_VALUE} characters")
+        tools = list(tools or [])
+        if len(tools) > MAX_TOOLS:
+            raise ValueError(f"at most {MAX_TOOLS} tools are allowed")
+        return FakeAgent(agent_id, name, model, instructions or '', [serialize_tool(t) for t in tools], metadata)
+
+
+def serialize_tool(tool) -> dict:
+    """The wire form of a tool object, as the SDK would send it"""
+    payload = tool.as_dict() if hasattr(tool, 'as_dict') else tool
+    if not isinstance(payload, dict) or not isinstance(payload.get('type'), str):
+        raise ValueError(f"Tool {tool!r} does not serialize to an object with a 'type'")
+    return payload
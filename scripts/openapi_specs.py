@@ -0,0 +1,201 @@
+"""
+Load, validate and cache OpenAPI specs referenced by agent tools (file://...).
+
+Specs are cached in-process by (path, mtime, size), so every tool and agent that points at
+the same file shares one parse. Set OPENAPI_SPEC_CACHE_DIR to also keep validated specs on
+disk between runs, keyed by the SHA-256 of the file content.
+
+Validation runs before anything is sent to Foundry. Full validation uses
+openapi-spec-validator when it is installed; otherwise the structural checks below apply.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import yaml
+
+try:
+    from openapi_spec_validator import validate as validate_with_library
+except ImportError:
+    validate_with_library = None
+
+HTTP_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+
+# Foundry exposes each operation as a function, so operationId must be a valid function name
+OPERATION_ID = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+PATH_PARAMETER = re.compile(r'{([^}/]+)}')
+
+
+def validate_openapi_spec(spec, source: str = 'spec') -> None:
+    """
+    Check that a parsed spec is an OpenAPI 3.x document Foundry can use.
+
+    Raises:
+        ValueError: listing every problem found
+    """
+    if not isinstance(spec, dict):
+        raise ValueError(f"Invalid OpenAPI spec {source}: expected an object, got {type(spec).__name__}")
+
+    errors = []
+    version = spec.get('openapi')
+    if not isinstance(version, str) or not version.startswith('3.'):
+        errors.append(f"'openapi' must be a 3.x version string, got {version!r}")
+
+    info = spec.get('info')
+    if not isinstance(info, dict):
+        errors.append("missing 'info' object")
+    else:
+        for field in ('title', 'version'):
+            if not info.get(field):
+                errors.append(f"missing info.{field}")
+
+    servers = spec.get('servers')
+    if not isinstance(servers, list) or not servers or not all(isinstance(s, dict) and s.get('url') for s in servers):
+        errors.append("'servers' must list at least one server with a 'url'")
+
+    paths = spec.get('paths')
+    if not isinstance(paths, dict) or not paths:
+        errors.append("'paths' must contain at least one path")
+        paths = {}
+
+    operation_ids = {}
+    for path, item in paths.items():
+        if not path.startswith('/'):
+            errors.append(f"path {path!r} must start with '/'")
+        if not isinstance(item, dict):
+            errors.append(f"path {path!r} must be an object")
+            continue
+        path_params = _parameter_names(item.get('parameters'))
+        for method, operation in item.items():
+            if method not in HTTP_METHODS:
+                continue
+            where = f"{method.upper()} {path}"
+            if not isinstance(operation, dict):
+                errors.append(f"{where}: operation must be an object")
+                continue
+            operation_id = operation.get('operationId')
+            if not operation_id:
+                errors.append(f"{where}: missing operationId")
+            elif not OPERATION_ID.match(operation_id):
+                errors.append(f"{where}: operationId {operation_id!r} must match {OPERATION_ID.pattern}")
+            elif operation_id in operation_ids:
+                errors.append(f"{where}: operationId {operation_id!r} already used by {operation_ids[operation_id]}")
+            else:
+                operation_ids[operation_id] = where
+            if not isinstance(operation.get('responses'), dict) or not operation['responses']:
+                errors.append(f"{where}: missing responses")
+            declared = path_params | _parameter_names(operation.get('parameters'))
+            for name in PATH_PARAMETER.findall(path):
+                if name not in declared:
+                    errors.append(f"{where}: path parameter {{{name}}} is not declared")
+
+    if validate_with_library is not None and not errors:
+        try:
+            validate_with_library(spec)
+        except Exception as e:
+            errors.append(str(e).splitlines()[0])
+
+    if errors:
+        raise ValueError(f"Invalid OpenAPI spec {source}:\n  - " + "\n  - ".join(errors))
+
+
+def _parameter_names(parameters) -> set:
+    """Names of the 'in: path' parameters in a parameter list"""
+    return {
+        p.get('name') for p in parameters or []
+        if isinstance(p, dict) and p.get('in') == 'path'
+    }
+
+
+class SpecCache:
+    """
+    Parsed, validated OpenAPI specs keyed by file identity.
+
+    Returned specs are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._entries: Dict[Tuple[str, int, int], Union[dict, str]] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'disk_hits': 0, 'loads': 0}
+
+    def load(self, path: Union[str, Path]) -> Union[dict, str]:
+        """
+        Return the spec at ``path``: a dict for .json files, otherwise the validated YAML text.
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            spec = self._entries.get(key)
+            if spec is not None:
+                self.stats['hits'] += 1
+                return spec
+            spec = self._load(path)
+            self._entries[key] = spec
+            return spec
+
+    def _load(self, path: Path) -> Union[dict, str]:
+        content = path.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+        is_json = path.suffix == '.json'
+
+        cached = self._read_disk(digest)
+        if cached is not None:
+            self.stats['disk_hits'] += 1
+            return cached if is_json else content.decode('utf-8')
+
+        self.stats['loads'] += 1
+        text = content.decode('utf-8')
+        try:
+            parsed = json.loads(text) if is_json else yaml.safe_load(text)
+        except (json.JSONDecodeError, yaml.YAMLError) as e:
+            raise ValueError(f"Invalid OpenAPI spec {path}: not valid {'JSON' if is_json else 'YAML'} ({e})")
+        validate_openapi_spec(parsed, str(path))
+        self._write_disk(digest, parsed)
+        return parsed if is_json else text
+
+    def _read_disk(self, digest: str) -> Optional[dict]:
+        # Only specs that passed validation are written, so a hit skips both parse and validation
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self.cache_dir / f"{digest}.json", 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, digest: str, spec: dict) -> None:
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            target = self.cache_dir / f"{digest}.json"
+            tmp = target.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, 'w') as f:
+                json.dump(spec, f, separators=(',', ':'))
+            os.replace(tmp, target)
+        except (OSError, TypeError, ValueError) as e:
+            # The disk cache is an optimization; never fail a deployment over it
+            print(f"⚠ Could not write OpenAPI spec cache: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+spec_cache = SpecCache(os.getenv('OPENAPI_SPEC_CACHE_DIR'))
+
+
+def load_openapi_spec(spec_url: str) -> Union[dict, str]:
+    """Resolve a file:// spec reference (relative to the working directory) through the shared cache"""
+    file_path = Path(spec_url.replace("file://", "", 1))
+    if not file_path.is_absolute():
+        file_path = Path.cwd() / file_path
+    return spec_cache.load(file_path)
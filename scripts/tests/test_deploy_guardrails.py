@@ -0,0 +1,18 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from deploy_guardrails import deploy_environments  # noqa: E402
+from deployment_engine import DeploymentEngine, LocalTransport  # noqa: E402
+
+
+def test_what_if_only_prints_the_what_if(tmp_path, capsys):
+    engine = DeploymentEngine(transport=LocalTransport(), cache_dir=str(tmp_path), poll_interval=0.0)
+    results = asyncio.run(deploy_environments(['nonprod'], engine=engine, what_if=True, deploy=False))
+
+    output = capsys.readouterr().out
+    assert [r.state for r in results] == ['WhatIfSucceeded']
+    assert f"[nonprod/{results[0].target.resource_group}] What-if:" in output
+    assert results[0].what_if in output
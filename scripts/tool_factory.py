@@ -14,6 +14,8 @@ from azure.ai.projects.models import (
     MCPTool
 )
 
+from .openapi_specs import load_openapi_spec
+
 
 def build_tools_from_yaml(project_client: AgentsClient, tools_cfg: List[Dict]):
     """
@@ -91,24 +93,13 @@ def build_tools_from_yaml(project_client: AgentsClient, tools_cfg: List[Dict]):
                     )
                 )
 
-            # Handle local file paths
+            # Handle local file paths: parsed and validated once per file (see openapi_specs.py)
             spec_content = spec_url
             if spec_url.startswith("file://"):
                 try:
-                    import json
-                    from pathlib import Path
-                    file_path = spec_url.replace("file://", "")
-                    # Resolve relative to current working directory if needed
-                    if not Path(file_path).is_absolute():
-                        file_path = Path.cwd() / file_path
-                    
-                    with open(file_path, 'r') as f:
-                        # Load as JSON/dict if possible, or string
-                        if file_path.suffix == '.json':
-                            spec_content = json.load(f)
-                        else:
-                            spec_content = f.read()
-                    print(f"Loaded OpenAPI spec from {file_path}")
+                    spec_content = load_openapi_spec(spec_url)
+                except ValueError:
+                    raise
                 except Exception as e:
                     raise ValueError(f"Failed to read OpenAPI spec file {spec_url}: {e}")
 
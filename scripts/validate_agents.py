@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Validate agent YAMLs offline, with per-file timings.
+
+Each file is checked against AGENT_SCHEMA, its tools are fully built with tool_factory, and
+the agent is created against an in-process fake of the AgentsClient API (fake_foundry.py).
+No credentials or network access are needed, so CI can check every agent definition before
+anything reaches Foundry. Files are validated in parallel worker processes, and each valid
+file reports the definition hash that deploy_agent compares against the deployed agent.
+
+Usage:
+  python -m scripts.validate_agents [<file | dir | "glob"> ...] [--workers N] [--json report.json]
+
+Example:
+  python -m scripts.validate_agents agents/
+  python -m scripts.validate_agents "agents/*.yaml" --workers 8 --json validation.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from jsonschema import Draft202012Validator
+
+from .deploy_agent import (
+    DEFAULT_INSTRUCTIONS,
+    definition_hash,
+    load_agent_yaml,
+    resolve_agent_paths,
+    validate_agent_definition,
+)
+from .fake_foundry import AGENT_NAME, MAX_METADATA_KEYS, MAX_METADATA_VALUE, MAX_TOOLS, FakeAgentsClient, serialize_tool
+from .tool_factory import build_tools_from_yaml
+
+TOOL_TYPES = ['azure_ai_search', 'file_search', 'openapi', 'mcp', 'code_interpreter', 'bing_connection']
+
+# Tool types that tool_factory accepts but does not turn into a tool object
+UNBUILT_TOOL_TYPES = {'bing_connection'}
+
+
+def _requires_options(tool_type: str, *alternatives: str) -> dict:
+    return {
+        'if': {'properties': {'type': {'const': tool_type}}, 'required': ['type']},
+        'then': {
+            'anyOf': [{'required': ['id']}, {'required': ['name']}],
+            'required': ['options'],
+            'properties': {'options': {'anyOf': [{'required': [key]} for key in alternatives]}},
+        },
+    }
+
+
+TOOL_SCHEMA = {
+    'type': 'object',
+    'anyOf': [{'required': ['type']}, {'required': ['kind']}],
+    'properties': {
+        'type': {'enum': TOOL_TYPES},
+        'kind': {'enum': TOOL_TYPES},
+        'id': {'type': 'string', 'minLength': 1},
+        'name': {'type': 'string', 'minLength': 1},
+        'description': {'type': 'string'},
+        'options': {'type': 'object'},
+    },
+    'allOf': [
+        _requires_options('openapi', 'specification', 'spec_url'),
+        _requires_options('mcp', 'server_url'),
+    ],
+}
+
+AGENT_SCHEMA = {
+    '$schema': 'https://json-schema.org/draft/2020-12/schema',
+    'type': 'object',
+    'required': ['name', 'model'],
+    'properties': {
+        'version': {'type': ['string', 'number']},
+        'name': {'type': 'string', 'pattern': AGENT_NAME.pattern},
+        'description': {'type': 'string'},
+        'id': {'type': 'string'},
+        'metadata': {
+            'type': 'object',
+            'maxProperties': MAX_METADATA_KEYS,
+            'additionalProperties': {'type': 'string', 'maxLength': MAX_METADATA_VALUE},
+        },
+        'model': {
+            'type': 'object',
+            'required': ['id'],
+            'properties': {
+                'id': {'type': 'string', 'minLength': 1},
+                'options': {
+                    'type': 'object',
+                    'properties': {
+                        'temperature': {'type': 'number', 'minimum': 0, 'maximum': 2},
+                        'top_p': {'type': 'number', 'minimum': 0, 'maximum': 1},
+                    },
+                },
+            },
+        },
+        'instructions': {'type': 'string'},
+        'tools': {'type': 'array', 'maxItems': MAX_TOOLS, 'items': TOOL_SCHEMA},
+    },
+}
+
+_validator = Draft202012Validator(AGENT_SCHEMA)
+
+
+def schema_errors(agent_def) -> List[str]:
+    """Every schema violation, as '<json path>: <message>'"""
+    return [
+        f"{'/'.join(str(p) for p in error.absolute_path) or '<root>'}: {error.message}"
+        for error in sorted(_validator.iter_errors(agent_def), key=lambda e: list(e.absolute_path))
+    ]
+
+
+def validate_file(path: str) -> dict:
+    """
+    Validate one agent YAML end to end without network access.
+
+    Returns:
+        dict: path, status ('valid' or 'invalid'), errors, warnings (tool_factory output),
+              name, tools, definition_sha256 and seconds
+    """
+    start = time.perf_counter()
+    result = {'path': path, 'status': 'invalid', 'errors': [], 'warnings': [], 'name': None}
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            agent_def = load_agent_yaml(path)
+            result['errors'] = schema_errors(agent_def)
+            if not result['errors']:
+                validate_agent_definition(agent_def)
+                result['name'] = agent_def['name']
+
+                client = FakeAgentsClient()
+                tools_cfg = agent_def.get('tools') or []
+                tools = build_tools_from_yaml(client, tools_cfg)
+                expected = sum(1 for t in tools_cfg if (t.get('type') or t.get('kind')) not in UNBUILT_TOOL_TYPES)
+                if len(tools) != expected:
+                    result['errors'].append(f"tools: built {len(tools)} of {expected} configured tools")
+                for tool in tools:
+                    serialize_tool(tool)
+
+                instructions = agent_def.get('instructions', DEFAULT_INSTRUCTIONS)
+                client.create_agent(model=agent_def['model']['id'], name=agent_def['name'], instructions=instructions, tools=tools)
+                result['tools'] = len(tools)
+                result['definition_sha256'] = definition_hash(agent_def['model']['id'], agent_def['name'], instructions, tools)
+    except Exception as e:
+        result['errors'].append(str(e))
+    result['warnings'] = [line.strip() for line in output.getvalue().splitlines() if line.startswith('⚠')]
+    if not result['errors']:
+        result['status'] = 'valid'
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def validate_files(paths: List[str], workers: int = os.cpu_count() or 1) -> List[dict]:
+    """Validate files in parallel worker processes and flag agent names used by more than one file"""
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            results = list(pool.map(validate_file, paths, chunksize=max(1, len(paths) // (workers * 4))))
+    else:
+        results = [validate_file(path) for path in paths]
+
+    by_name = {}
+    for result in results:
+        if result['name']:
+            by_name.setdefault(result['name'], []).append(result)
+    for name, same in by_name.items():
+        if len(same) > 1:
+            for result in same:
+                others = ', '.join(r['path'] for r in same if r is not result)
+                result['errors'].append(f"name: agent '{name}' is also defined in {others}")
+                result['status'] = 'invalid'
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate agent YAMLs offline")
+    parser.add_argument('targets', nargs='*', default=['agents/'], help="Agent YAML files, directories or globs (default: agents/)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Worker processes (default: CPU count)")
+    parser.add_argument('--json', dest='json_path', help="Also write the report as JSON to this path")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        paths = sorted({path for target in args.targets for path in resolve_agent_paths(target)})
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    results = validate_files(paths, args.workers)
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        mark = '✅' if result['status'] == 'valid' else '❌'
+        detail = f"{result['tools']} tools, sha256 {result['definition_sha256'][:12]}" if result['status'] == 'valid' else ''
+        print(f"{mark} {result['seconds'] * 1000:8.1f} ms  {result['path']}  {detail}")
+        for error in result['errors']:
+            print(f"      - {error}")
+        for warning in result['warnings']:
+            print(f"      {warning}")
+
+    invalid = sum(1 for r in results if r['status'] != 'valid')
+    workers = max(1, min(args.workers, len(paths)))
+    print(f"\n{len(results) - invalid} valid, {invalid} invalid in {elapsed:.2f}s ({workers} workers)")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'elapsed_seconds': elapsed, 'results': results}, f, indent=2)
+
+    sys.exit(1 if invalid else 0)
+
+
+if __name__ == '__main__':
+    main()